@@ -1,10 +1,11 @@
 import tkinter as tk
 from tkinter import messagebox
 import time
-import matplotlib.pyplot as plt
-import math
-import sys
+from ai_worker import AIWorker
+from stats_plot import show_search_stats
 from styled_wrapper import create_styled_game
+from engine.bitboard import cell_position, evaluate, from_board
+from engine.variants import create
 
 class TicTacToe:
     def __init__(self, master):
@@ -18,9 +19,11 @@ class TicTacToe:
 
         self.buttons = [[0 for _ in range(3)] for _ in range(3)]
         self.board = [['-' for _ in range(3)] for _ in range(3)]
+        self.player = create("symmetry")
+        self.worker = AIWorker(master, self.player)
         self.current_player = self.choose_starting_player()
         self.execution_times = []
-        self.space_complexity = []
+        self.search_stats = []
 
         for i in range(3):
             for j in range(3):
@@ -29,7 +32,7 @@ class TicTacToe:
                 self.buttons[i][j].grid(row=i, column=j)
 
         # Create calculate button but don't add it to layout - styled wrapper will handle this
-        self.calculate_button = tk.Button(master, text="Calculate Time Complexity and Space Complexity", command=self.calculate_and_show_plot)
+        self.calculate_button = tk.Button(master, text="Calculate Time Complexity", command=self.calculate_and_show_plot)
         # Removed: self.calculate_button.grid(row=3, column=0, columnspan=3)
 
         if self.current_player == 'X':
@@ -40,90 +43,20 @@ class TicTacToe:
         return 'O' if result else 'X'
 
     def evaluate(self, board):
-        for row in board:
-            if row.count('X') == 3:
-                return 10
-            elif row.count('O') == 3:
-                return -10
-
-        for col in range(3):
-            if board[0][col] == board[1][col] == board[2][col]:
-                if board[0][col] == 'X':
-                    return 10
-                elif board[0][col] == 'O':
-                    return -10
-
-        if board[0][0] == board[1][1] == board[2][2]:
-            if board[0][0] == 'X':
-                return 10
-            elif board[0][0] == 'O':
-                return -10
-
-        if board[0][2] == board[1][1] == board[2][0]:
-            if board[0][2] == 'X':
-                return 10
-            elif board[0][2] == 'O':
-                return -10
-
-        return 0
-
-    def minimax(self, board, depth, is_maximizing):
-        # Check for symmetry to reduce search space
-        board = self.normalize_board(board)
-        
-        score = self.evaluate(board)
-        if score == 10:
-            return score - depth
-        if score == -10:
-            return score + depth
-        if not any('-' in row for row in board):
-            return 0
-
-        if is_maximizing:
-            best = -math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'X'
-                        best = max(best, self.minimax(board, depth + 1, False))
-                        board[i][j] = '-'
-            return best
-        else:
-            best = math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'O'
-                        best = min(best, self.minimax(board, depth + 1, True))
-                        board[i][j] = '-'
-            return best
-    
-    def normalize_board(self, board):
-        # Normalize the board by considering symmetries
-        # This reduces the search space by eliminating equivalent board states
-        
-        # For simplicity, we'll just return the original board in this implementation
-        # In a full implementation, this would identify and normalize symmetric positions
-        return board
+        x, o = from_board(board)
+        return evaluate(x, o)
 
     def ai_move(self):
-        start_time = time.time()
+        self.move_start_time = time.time()
+        self.current_player = 'X'
 
-        best_val = -math.inf
-        best_move = (-1, -1)
+        x, o = from_board(self.board)
+        self.worker.start(x, o, self.place_ai_move)
 
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == '-':
-                    self.board[i][j] = 'X'
-                    move_val = self.minimax(self.board, 0, False)
-                    self.board[i][j] = '-'
-
-                    if move_val > best_val:
-                        best_move = (i, j)
-                        best_val = move_val
-
-        row, col = best_move
+    def place_ai_move(self, cell, stats):
+        start_time = self.move_start_time
+        lag = self.worker.lags[-1]
+        row, col = cell_position(cell)
         self.buttons[row][col].config(text='X', state=tk.DISABLED)
         self.board[row][col] = 'X'
 
@@ -142,11 +75,11 @@ class TicTacToe:
         end_time = time.time()
         execution_time = end_time - start_time
         self.execution_times.append(execution_time)
+        self.search_stats.append(stats)
 
-        space_used = sys.getsizeof(self.board)
-        self.space_complexity.append(space_used)
-
-        print(f"AI Move Execution Time: {execution_time} seconds, Space Complexity: {space_used} bytes")
+        print(f"AI Move Execution Time: {execution_time} seconds")
+        print(f"Search: {stats}")
+        print(f"Event Loop Lag: {lag * 1000:.1f} ms")
 
     def on_click(self, row, col):
         if self.board[row][col] == '-' and self.current_player == 'O':
@@ -169,6 +102,7 @@ class TicTacToe:
       self.score_label.config(text=f"AI: {self.ai_score}  You: {self.player_score}")
 
     def reset_board(self):
+        self.worker.cancel()
         play_again = messagebox.askyesno("Tic Tac Toe", "Do you want to play again?")
         if play_again:
             for i in range(3):
@@ -181,20 +115,7 @@ class TicTacToe:
                 self.ai_move()
 
     def calculate_and_show_plot(self):
-        moves = list(range(1, len(self.execution_times) + 1))
-        plt.plot(moves, self.execution_times, marker='o', label='Time Complexity')
-        plt.plot(moves, self.space_complexity, marker='o', label='Space Complexity')
-        plt.xlabel('AI Moves')
-        plt.ylabel('Complexity')
-        plt.title('Time and Space Complexity Analysis for Each AI Move')
-        plt.legend()
-        plt.show()
-
-        average_time_complexity = sum(self.execution_times) / len(self.execution_times)
-        print(f"Average Time Complexity: {average_time_complexity} seconds")
-
-        average_space_complexity = sum(self.space_complexity) / len(self.space_complexity)
-        print(f"Average Space Complexity: {average_space_complexity} bytes")
+        show_search_stats(self.execution_times, self.search_stats)
 
 if __name__ == "__main__":
     root = tk.Tk()
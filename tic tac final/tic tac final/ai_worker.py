@@ -0,0 +1,83 @@
+"""
+Runs the AI's search off the Tk event thread.
+
+tkinter may only be touched from the thread running mainloop, so the
+worker thread never calls into Tk: it puts its result on a queue that the
+Tk thread polls with ``after()``, and the polling callback hands the move
+to the game. Resetting the game or closing the window cancels the search
+in flight through its cancel event. An error raised by the search is
+put on the queue in place of the move and raised again by the polling
+callback, so it reaches Tk's error reporting instead of leaving the game
+waiting on a move that never comes.
+
+The polls double as a lag probe. Each one is scheduled POLL_MS ahead, so
+the time past that at which it actually runs is how long the event loop
+was blocked; the worst of the move is kept in ``lags``.
+"""
+
+import queue
+import threading
+import time
+
+from engine.search import SearchCancelled
+
+
+class AIWorker:
+    POLL_MS = 10
+
+    def __init__(self, widget, player):
+        self.widget = widget
+        self.player = player
+        self.thread = None
+        self.cancel_event = None
+        self.lags = []  # Worst event-loop lag of every move, in seconds
+        widget.winfo_toplevel().protocol("WM_DELETE_WINDOW", self.close)
+
+    @property
+    def busy(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, x, o, on_done):
+        """Search X's move on a worker thread, then call ``on_done(cell, stats)`` on the Tk thread"""
+        self.cancel()
+        self.cancel_event = threading.Event()
+        results = queue.Queue()
+        self.thread = threading.Thread(target=self._run, args=(x, o, self.cancel_event, results), daemon=True)
+        self.thread.start()
+        self.lags.append(0.0)
+        self.widget.after(self.POLL_MS, self._poll, self.cancel_event, results, on_done, time.perf_counter())
+
+    def _run(self, x, o, cancel, results):
+        try:
+            results.put(self.player.move(x, o, cancel))
+        except SearchCancelled:
+            pass
+        except Exception as error:
+            results.put(error)
+
+    def _poll(self, cancel, results, on_done, scheduled):
+        if cancel.is_set():
+            return
+        lag = time.perf_counter() - scheduled - self.POLL_MS / 1000
+        self.lags[-1] = max(self.lags[-1], lag)
+        try:
+            result = results.get_nowait()
+        except queue.Empty:
+            self.widget.after(self.POLL_MS, self._poll, cancel, results, on_done, time.perf_counter())
+            return
+        if isinstance(result, Exception):
+            raise result
+        cell, stats = result
+        on_done(cell, stats)
+
+    def cancel(self):
+        """Stop the search in flight, if any, and wait for its thread so the engine is free"""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+        if self.busy:
+            self.thread.join()
+        self.thread = None
+
+    def close(self):
+        self.cancel()
+        self.widget.winfo_toplevel().destroy()
@@ -0,0 +1,5 @@
+"""
+Headless benchmarks for the engine. Run them from the game directory, e.g.
+
+    python -m benchmarks.symmetry
+"""
@@ -0,0 +1,67 @@
+"""
+Throughput of the NumPy batch evaluation against the scalar one.
+
+Scores the same random positions with evaluate_batch and with a Python
+loop over the scalar evaluate and threat score, and checks that both
+agree on every position.
+
+    python -m benchmarks.batch
+"""
+
+import random
+import time
+
+import numpy as np
+
+from engine.batch import evaluate_batch, to_array
+from engine.nxn import Board
+
+# (rows, cols, win length, positions)
+BOARDS = [(3, 3, 3, 500_000), (5, 5, 4, 100_000), (8, 8, 5, 20_000)]
+
+
+def random_positions(board, count, rng):
+    positions = []
+    cells = list(range(board.cells))
+    for _ in range(count):
+        rng.shuffle(cells)
+        pieces = rng.randrange(board.cells + 1)
+        positions.append((sum(1 << cell for cell in cells[:pieces:2]), sum(1 << cell for cell in cells[1:pieces:2])))
+    return positions
+
+
+def scalar(board, positions):
+    terminal = []
+    winner = []
+    heuristic = []
+    for x, o in positions:
+        result = board.evaluate(x, o)
+        terminal.append(result != 0 or x | o == board.full)
+        winner.append((result > 0) - (result < 0))
+        heuristic.append(board.threat_score(x, o))
+    return terminal, winner, heuristic
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'Board':<14}{'Positions':>11}{'Scalar (/s)':>14}{'Batch (/s)':>14}{'Speedup':>9}")
+    for rows, cols, k, count in BOARDS:
+        board = Board(rows, cols, k)
+        positions = random_positions(board, count, rng)
+        array = to_array(positions, board)
+
+        start = time.perf_counter()
+        expected = scalar(board, positions)
+        scalar_time = time.perf_counter() - start
+        start = time.perf_counter()
+        result = evaluate_batch(array, board)
+        batch_time = time.perf_counter() - start
+
+        for got, want in zip(result, expected):
+            assert np.array_equal(got, want)
+        print(f"{f'{rows}x{cols}, k={k}':<14}{count:>11}{count / scalar_time:>14,.0f}"
+              f"{count / batch_time:>14,.0f}{scalar_time / batch_time:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Hit rate of the opening book and the think time it saves.
+
+Every menu variant plays ``--games`` games from each side against an
+opponent playing random moves, once searching every move and once with
+its line of the opening book. Both runs face the same random moves. The
+book is read from engine/opening_book.json if it has been built, and
+generated in memory otherwise.
+
+The report gives, per variant, the moves the book was probed for (the
+ones no rule answered), the hits and hit rate, the mean think time of a
+game without and with the book, and of the AI's first move alone.
+
+    python -m benchmarks.book
+    python -m benchmarks.book --games 20 --seed 1
+"""
+
+import argparse
+import random
+import time
+
+from engine import book
+from engine.bitboard import CELLS, FULL, WINNING
+from engine.variants import MENU_LABELS, VARIANTS, create
+
+
+def play(player, seed, ai_first):
+    """Seconds the player thought over one game against random moves, and on its first move"""
+    rng = random.Random(seed)
+    x = o = 0
+    x_to_move = ai_first
+    think = []
+    while not (WINNING[x] or WINNING[o] or x | o == FULL):
+        if x_to_move:
+            start = time.perf_counter()
+            cell, _ = player.move(x, o)
+            think.append(time.perf_counter() - start)
+            x |= 1 << cell
+        else:
+            o |= 1 << rng.choice([cell for cell in range(CELLS) if not (x | o) >> cell & 1])
+        x_to_move = not x_to_move
+    return sum(think), think[0]
+
+
+def run(name, opening, games, seed):
+    """Mean seconds per game and per first move over every game from both sides"""
+    total = first = 0.0
+    for game in range(games):
+        for ai_first in (True, False):
+            # A new player per game, as a new game window creates one; the book keeps counting
+            player = create(name, book=False)
+            player.book = opening
+            game_time, first_time = play(player, seed + game, ai_first)
+            total += game_time
+            first += first_time
+    count = 2 * games
+    return total / count, first / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=10, help="games per side")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random opponent")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+    args = parser.parse_args(argv)
+
+    loaded = book.load()
+    print(f"Opening book: {'engine/opening_book.json' if loaded else 'generated in memory'}, "
+          f"{book.PLIES} plies, {args.games} games per side\n")
+    print(f"{'Variant':<44}{'Probes':>8}{'Hits':>6}{'Rate':>7}"
+          f"{'Search (ms/game)':>18}{'Book (ms/game)':>16}{'Search (ms/1st)':>17}{'Book (ms/1st)':>15}")
+    for name in args.variants:
+        opening = loaded.opening("variants", name) if loaded else book.OpeningBook(book.generate(create(name, book=False)))
+        search_game, search_first = run(name, None, args.games, args.seed)
+        book_game, book_first = run(name, opening, args.games, args.seed)
+        print(f"{MENU_LABELS[name]:<44}{opening.probes:>8}{opening.hits:>6}{opening.hit_rate:>7.0%}"
+              f"{search_game * 1000:>18.2f}{book_game * 1000:>16.2f}"
+              f"{search_first * 1000:>17.2f}{book_first * 1000:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
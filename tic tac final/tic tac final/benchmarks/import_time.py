@@ -0,0 +1,111 @@
+"""
+Cold-import time of the headless engine, the GUI modules and every game.
+
+Every sample imports the module in a fresh interpreter with ``-X importtime``
+and reads the cumulative time of the module itself, so interpreter start-up
+is not counted. A game script is loaded the way the menu's launcher loads
+it, without running its ``__main__`` block, and its sample is the sum of
+the imports it makes. The median over the runs must stay under the budget,
+and no forbidden module may be loaded on the way: the engine must not pull
+in tkinter, and nothing may pull in matplotlib or NumPy, which only load
+when a plot is drawn or a batch is evaluated. The exit status is 1 if any
+check fails.
+
+    python -m benchmarks.import_time
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+from menu import menu_structure
+
+# Modules nothing may load at start-up, and the ones the engine may not load either
+FORBIDDEN = ("matplotlib", "numpy")
+HEADLESS = ("tkinter",) + FORBIDDEN
+
+# (module, budget in milliseconds, forbidden modules)
+MODULES = [
+    ("engine", 50, HEADLESS),
+    ("engine.variants", 50, HEADLESS),
+    ("stats_plot", 50, FORBIDDEN),
+    ("styled_wrapper", 100, FORBIDDEN),
+    ("launcher", 100, FORBIDDEN),
+]
+SCRIPTS = [script for options in menu_structure.values() for script in options.values()]
+SCRIPTS += ["modern_game_board.py", os.path.join("cen&cor", "centermin.py"), os.path.join("cen&cor", "cornermin.py")]
+SCRIPT_BUDGET = 100
+RUNS = 7
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Written to stderr just before a script is loaded, so only its own imports are counted
+MARKER = "-- script --"
+LOADED = "import sys; print(','.join(m for m in sys.modules if m.split('.')[0] in {forbidden!r}))"
+
+
+def run(code, *args):
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code, *args],
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+    loaded = [name for name in process.stdout.strip().split(",") if name]
+    return process.stderr.splitlines(), loaded
+
+
+def import_time(module, forbidden):
+    """Milliseconds to import ``module`` in a new interpreter, and the forbidden modules it loaded"""
+    lines, loaded = run(f"import {module}; " + LOADED.format(forbidden=forbidden))
+    micros = None
+    for line in lines:
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            micros = int(parts[1])
+    return micros / 1000, loaded
+
+
+def script_time(script, forbidden=FORBIDDEN):
+    """Milliseconds of the imports made by loading ``script`` in a new interpreter, and the forbidden modules loaded"""
+    code = ("import runpy, sys; "
+            f"sys.stderr.write({MARKER!r} + '\\n'); sys.stderr.flush(); "
+            "runpy.run_path(sys.argv[1], run_name='variant'); " + LOADED.format(forbidden=forbidden))
+    lines, loaded = run(code, script)
+    micros = 0
+    counting = False
+    for line in lines:
+        if line == MARKER:
+            counting = True
+            continue
+        parts = line.split("|")
+        # Top-level imports only; the nested ones are in their cumulative time
+        if counting and len(parts) == 3 and parts[2].startswith(" ") and not parts[2].startswith("  "):
+            micros += int(parts[1])
+    return micros / 1000, loaded
+
+
+def check(name, budget, sample):
+    samples = []
+    loaded = []
+    for _ in range(RUNS):
+        elapsed, loaded = sample()
+        samples.append(elapsed)
+    median = statistics.median(samples)
+    result = "ok" if median <= budget else "over budget"
+    if loaded:
+        result = "loads " + ", ".join(loaded)
+    print(f"{name:<40}{median:>13.1f}{max(samples):>10.1f}{budget:>13}  {result}")
+    return result == "ok"
+
+
+def main():
+    passed = True
+    print(f"{'Module':<40}{'Median (ms)':>13}{'Max (ms)':>10}{'Budget (ms)':>13}  Result")
+    for module, budget, forbidden in MODULES:
+        passed &= check(module, budget, lambda: import_time(module, forbidden))
+    for script in SCRIPTS:
+        passed &= check(script, SCRIPT_BUDGET, lambda: script_time(script))
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Depth-limited threat-score search with and without incremental line counts.
+
+Every board's positions are searched twice to the same depth: scoring
+each leaf by rescanning every line (Board.threat_score), then reading
+the totals LineCounts keeps through make and unmake. Both must return
+the same value, move and node count.
+
+    python -m benchmarks.line_counts
+"""
+
+import random
+import time
+
+from engine.nxn import Board, BoardNegamax, LineCounts
+
+# (rows, cols, win length, plies below the root)
+BOARDS = [(3, 3, 3, 3), (4, 4, 3, 2), (5, 5, 4, 2), (6, 6, 5, 1), (8, 8, 5, 1)]
+POSITIONS = 10
+PIECES = 4
+
+
+def positions(board, rng):
+    """Random unfinished positions with X to move"""
+    found = []
+    while len(found) < POSITIONS:
+        cells = rng.sample(range(board.cells), PIECES)
+        x = sum(1 << cell for cell in cells[0::2])
+        o = sum(1 << cell for cell in cells[1::2])
+        if not board.is_win(x) and not board.is_win(o):
+            found.append((x, o))
+    return found
+
+
+def run(engine, positions):
+    """Seconds to search every position, and the results"""
+    start = time.perf_counter()
+    results = [engine.search(x, o) for x, o in positions]
+    return time.perf_counter() - start, results
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'Board':<14}{'Depth':>6}{'Leaves':>10}{'Rescan (ms)':>13}{'Counts (ms)':>13}{'Speedup':>9}")
+    for rows, cols, k, depth in BOARDS:
+        board = Board(rows, cols, k)
+        counts = LineCounts(board)
+        found = positions(board, rng)
+        rescan, expected = run(BoardNegamax(board, board.threat_score, max_depth=depth, alphabeta=False), found)
+        incremental, results = run(
+            BoardNegamax(board, counts.threat_score, max_depth=depth, alphabeta=False, line_counts=counts), found)
+        for a, b in zip(expected, results):
+            assert (a.value, a.move, a.stats.nodes) == (b.value, b.move, b.stats.nodes)
+        leaves = sum(result.stats.leaves for result in results)
+        print(f"{f'{rows}x{cols}, k={k}':<14}{depth:>6}{leaves:>10}"
+              f"{rescan * 1000:>13.1f}{incremental * 1000:>13.1f}{rescan / incremental:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Playout rate and decision quality of the Monte Carlo tree search.
+
+Playouts per second: MCTS searches random early positions of every board
+for a fixed time, with each rollout policy.
+
+Decision quality: on 3x3, where the exact values are known, MCTS picks a
+move in every position of the first 4 plies (one per symmetry class, as
+in benchmarks.suite) with a growing playout budget. A move is counted as
+perfect if it keeps the position's result under perfect play: a win, a
+draw or a loss, however quick.
+
+    python -m benchmarks.mcts
+"""
+
+import random
+import time
+
+from benchmarks.suite import corpus
+from engine.mcts import MCTS, ROLLOUTS
+from engine.nxn import Board
+from engine.search import Negamax
+from engine.transposition import TranspositionTable
+
+# (rows, cols, win length)
+BOARDS = [(3, 3, 3), (5, 5, 4), (7, 7, 5), (9, 9, 5)]
+POSITIONS = 5
+PIECES = 4
+SEARCH_MS = 200
+BUDGETS = [100, 1000, 10000]
+
+
+def positions(board, rng):
+    """Random unfinished positions with X to move"""
+    found = []
+    while len(found) < POSITIONS:
+        cells = rng.sample(range(board.cells), PIECES)
+        x = sum(1 << cell for cell in cells[0::2])
+        o = sum(1 << cell for cell in cells[1::2])
+        if not board.is_win(x) and not board.is_win(o):
+            found.append((x, o))
+    return found
+
+
+def playout_rate(board, rollout, found):
+    engine = MCTS(board, time_limit=SEARCH_MS, rollout=rollout, rng=random.Random(0))
+    played = 0
+    start = time.perf_counter()
+    for x, o in found:
+        played += engine.search(x, o).stats.playouts
+    return played / (time.perf_counter() - start)
+
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+def perfect_moves(rollout, budget, positions, exact):
+    """Share of ``positions`` where MCTS plays a move that keeps the result of perfect play"""
+    engine = MCTS(Board(3, 3, 3), playouts=budget, rollout=rollout, rng=random.Random(0))
+    perfect = 0
+    for x, o in positions:
+        cell = engine.search(x, o).move
+        best = exact.search(x, o).value
+        played = exact.search(x, o, moves=1 << cell).value
+        perfect += sign(played) == sign(best)
+    return perfect / len(positions)
+
+
+def main():
+    rng = random.Random(0)
+    print(f"Playouts per second, {POSITIONS} positions of {PIECES} pieces searched for {SEARCH_MS} ms each\n")
+    print(f"{'Board':<14}" + "".join(f"{rollout:>12}" for rollout in ROLLOUTS))
+    for rows, cols, k in BOARDS:
+        board = Board(rows, cols, k)
+        found = positions(board, rng)
+        rates = [playout_rate(board, rollout, found) for rollout in ROLLOUTS]
+        print(f"{f'{rows}x{cols}, k={k}':<14}" + "".join(f"{rate:>12.0f}" for rate in rates))
+
+    found = corpus(4)
+    exact = Negamax(table=TranspositionTable())
+    print(f"\nPerfect moves on 3x3, {len(found)} positions of the first 4 plies\n")
+    print(f"{'Playouts':<14}" + "".join(f"{rollout:>12}" for rollout in ROLLOUTS))
+    for budget in BUDGETS:
+        shares = [perfect_moves(rollout, budget, found, exact) for rollout in ROLLOUTS]
+        print(f"{budget:<14}" + "".join(f"{share:>12.1%}" for share in shares))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Alpha-beta node counts under each move ordering.
+
+    python -m benchmarks.ordering
+"""
+
+import time
+
+from engine.ordering import MoveOrdering
+from engine.search import Negamax
+from engine.transposition import TranspositionTable
+from benchmarks.symmetry import POSITIONS
+
+ORDERINGS = [
+    ("Row-major", dict(static=False)),
+    ("Static", dict()),
+    ("Static + killers", dict(killers=True)),
+    ("Static + history", dict(history=True)),
+    ("Static + killers + history", dict(killers=True, history=True)),
+]
+
+
+def run(options):
+    """Nodes, cutoffs, first-move cutoffs and seconds over every benchmark position"""
+    nodes = cutoffs = first = 0
+    elapsed = 0.0
+    for _, x, o, x_to_move in POSITIONS:
+        ordering = MoveOrdering(**options)
+        start = time.perf_counter()
+        Negamax(table=TranspositionTable(), ordering=ordering).search(x, o, x_to_move)
+        elapsed += time.perf_counter() - start
+        nodes += ordering.nodes
+        cutoffs += ordering.cutoffs
+        first += ordering.first_move_cutoffs
+    return nodes, cutoffs, first, elapsed
+
+
+def main():
+    print(f"{'Ordering':<30}{'Nodes':>10}{'Cutoffs':>10}{'First move':>12}{'Time (ms)':>12}")
+    for label, options in ORDERINGS:
+        nodes, cutoffs, first, elapsed = run(options)
+        print(f"{label:<30}{nodes:>10}{cutoffs:>10}{first / cutoffs:>12.1%}{elapsed * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Speedup of the root-split parallel search over the sequential one.
+
+Every 3x3 configuration is searched from every benchmark position with
+Negamax and then with ParallelNegamax at 1, 2, 4, ... workers up to the
+core count; every board configuration from random positions of its
+board with BoardNegamax and ParallelBoardNegamax, scored by the threat
+heuristic on line counts. A 3x3 subtree is too small to pay for a trip
+to another process, a large board's is not. The pool is started and
+warmed up before it is timed, since a game keeps it for every move.
+
+    python -m benchmarks.parallel
+"""
+
+import os
+import random
+import time
+
+from engine.evaluation import threat_score
+from engine.nxn import Board, BoardNegamax, LineCounts
+from engine.parallel import ParallelBoardNegamax, ParallelNegamax
+from engine.search import Negamax
+from benchmarks.mcts import positions
+from benchmarks.symmetry import POSITIONS
+
+# (label, Negamax options)
+CONFIGS = [
+    ("Minimax", dict(alphabeta=False)),
+    ("Alpha-beta", dict()),
+    ("Threat score, depth 6", dict(evaluation=threat_score, max_depth=6, alphabeta=False)),
+]
+
+# (label, (rows, cols, win length), BoardNegamax options)
+BOARD_CONFIGS = [
+    ("7x7, k=5, depth 2", (7, 7, 5), dict(max_depth=2, alphabeta=False)),
+    ("7x7, k=5, depth 5", (7, 7, 5), dict(max_depth=5)),
+]
+
+
+def worker_counts():
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    # Two workers at least, so the table shows the overhead on single-core machines too
+    return counts if len(counts) > 1 else [1, 2]
+
+
+def run(engine, found=None):
+    """Seconds to search every position of ``found``, (x, o) with X to move, or every benchmark position"""
+    found = [(x, o, x_to_move) for _, x, o, x_to_move in POSITIONS] if found is None else [
+        (x, o, True) for x, o in found]
+    start = time.perf_counter()
+    for x, o, x_to_move in found:
+        engine.search(x, o, x_to_move)
+    return time.perf_counter() - start
+
+
+def board_engine(engine_class, board, options, **extra):
+    """``engine_class`` on ``board`` scored by the threat heuristic, read from its own line counts"""
+    counts = LineCounts(board)
+    return engine_class(board, counts.threat_score, line_counts=counts, **options, **extra)
+
+
+def report(label, sequential, parallel_times):
+    print(f"{label:<24}{'-':>8}{sequential * 1000:>12.1f}{1:>10.2f}{'':>12}")
+    for workers, elapsed in parallel_times:
+        speedup = sequential / elapsed
+        print(f"{'':<24}{workers:>8}{elapsed * 1000:>12.1f}{speedup:>10.2f}{speedup / workers:>12.1%}")
+
+
+def main():
+    print(f"{os.cpu_count()} cores")
+    print(f"{'Search':<24}{'Workers':>8}{'Time (ms)':>12}{'Speedup':>10}{'Efficiency':>12}")
+    for label, options in CONFIGS:
+        sequential = run(Negamax(**options))
+        parallel_times = []
+        for workers in worker_counts():
+            with ParallelNegamax(workers=workers, **options) as engine:
+                run(engine)
+                parallel_times.append((workers, run(engine)))
+        report(label, sequential, parallel_times)
+    for label, size, options in BOARD_CONFIGS:
+        board = Board(*size)
+        found = positions(board, random.Random(0))
+        sequential = run(board_engine(BoardNegamax, board, options), found)
+        parallel_times = []
+        for workers in worker_counts():
+            with board_engine(ParallelBoardNegamax, board, options, workers=workers) as engine:
+                run(engine, found[:1])
+                parallel_times.append((workers, run(engine, found)))
+        report(label, sequential, parallel_times)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Playouts per second and decision quality of the parallel MCTS per worker count.
+
+Playouts per second: MCTS, then ParallelMCTS in root and tree mode at 1,
+2, 4, ... workers up to the core count, search the same random 7x7, k=5
+positions for a fixed time each. The pool is started and warmed up
+before it is timed, since a game keeps it for every move.
+
+Decision quality: every worker runs a fixed number of playouts on every
+3x3 position of the first 4 plies, so more workers means more playouts
+per move; a move is perfect if it keeps the result of perfect play, as
+in benchmarks.mcts.
+
+    python -m benchmarks.parallel_mcts
+"""
+
+import os
+import random
+import time
+
+from benchmarks.mcts import positions, sign
+from benchmarks.parallel import worker_counts
+from benchmarks.suite import corpus
+from engine.mcts import MCTS
+from engine.nxn import Board
+from engine.parallel_mcts import MODES, ParallelMCTS
+from engine.search import Negamax
+from engine.transposition import TranspositionTable
+
+BOARD = (7, 7, 5)
+SEARCH_MS = 500
+PLAYOUTS_PER_WORKER = 50
+
+
+def playout_rate(engine, found):
+    played = 0
+    start = time.perf_counter()
+    for x, o in found:
+        played += engine.search(x, o).stats.playouts
+    return played / (time.perf_counter() - start)
+
+
+def perfect_moves(engine, found, exact):
+    perfect = 0
+    for x, o in found:
+        cell = engine.search(x, o).move
+        perfect += sign(exact.search(x, o, moves=1 << cell).value) == sign(exact.search(x, o).value)
+    return perfect / len(found)
+
+
+def main():
+    board = Board(*BOARD)
+    found = positions(board, random.Random(0))
+    small = Board(3, 3, 3)
+    early = corpus(4)
+    exact = Negamax(table=TranspositionTable())
+
+    print(f"{os.cpu_count()} cores; {len(found)} {board} positions for {SEARCH_MS} ms each, "
+          f"{len(early)} 3x3 positions with {PLAYOUTS_PER_WORKER} playouts per worker")
+    print(f"{'Search':<16}{'Workers':>8}{'Playouts/s':>12}{'Speedup':>10}{'Perfect moves':>15}")
+    sequential = playout_rate(MCTS(board, time_limit=SEARCH_MS), found)
+    quality = perfect_moves(MCTS(small, playouts=PLAYOUTS_PER_WORKER), early, exact)
+    print(f"{'MCTS':<16}{'-':>8}{sequential:>12.0f}{1:>10.2f}{quality:>15.1%}")
+    for mode in MODES:
+        for index, workers in enumerate(worker_counts()):
+            with ParallelMCTS(board, workers=workers, mode=mode, time_limit=SEARCH_MS) as engine:
+                engine.search(*found[0])
+                rate = playout_rate(engine, found)
+            with ParallelMCTS(small, workers=workers, mode=mode, playouts=PLAYOUTS_PER_WORKER * workers) as engine:
+                quality = perfect_moves(engine, early, exact)
+            label = f"{mode} parallel" if index == 0 else ""
+            print(f"{label:<16}{workers:>8}{rate:>12.0f}{rate / sequential:>10.2f}{quality:>15.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Proof-number search against alpha-beta at solving the empty board.
+
+Every board's empty position is solved by the df-pn ProofSolver and by
+an exact alpha-beta BoardNegamax with a transposition table and move
+ordering. Both must agree on the result. Forced wins are where proofs
+shine: one winning answer to every defence is enough. A draw takes two
+proofs (neither side wins), each of which has to refute every line, so
+large drawn boards stay expensive for both.
+
+    python -m benchmarks.proof
+"""
+
+import time
+
+from engine.nxn import Board, BoardNegamax
+from engine.ordering import MoveOrdering
+from engine.proof import DRAW, LOSS, WIN, ProofSolver
+from engine.transposition import TranspositionTable
+
+# (rows, cols, win length)
+BOARDS = [(3, 3, 3), (3, 4, 3), (4, 4, 3), (4, 5, 3)]
+
+NAMES = {WIN: "win", DRAW: "draw", LOSS: "loss", None: "unknown"}
+
+
+def main():
+    print(f"{'Board':<14}{'Result':>8}{'Proof nodes':>13}{'Proof (ms)':>12}"
+          f"{'Alpha-beta nodes':>18}{'Alpha-beta (ms)':>17}{'Node ratio':>12}")
+    for rows, cols, k in BOARDS:
+        board = Board(rows, cols, k)
+        start = time.perf_counter()
+        proof = ProofSolver(board).solve(0, 0)
+        proof_time = time.perf_counter() - start
+        engine = BoardNegamax(board, table=TranspositionTable(), ordering=MoveOrdering(board=board))
+        start = time.perf_counter()
+        result = engine.search(0, 0)
+        search_time = time.perf_counter() - start
+        assert proof.result == (result.value > 0) - (result.value < 0)
+        print(f"{f'{rows}x{cols}, k={k}':<14}{NAMES[proof.result]:>8}{proof.nodes:>13}{proof_time * 1000:>12.1f}"
+              f"{result.stats.nodes:>18}{search_time * 1000:>17.1f}{result.stats.nodes / proof.nodes:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Time from choosing a variant in the menu to its board on screen.
+
+Compares the two ways the menu can open a game:
+
+- subprocess: a new interpreter runs the script, as the menu used to;
+  timed from Popen until the script's window has been drawn
+- in-process: launcher.Launcher opens the game in a Toplevel of a running
+  Tk root; timed once for the first launch of each script, which imports
+  it, and again once every script is loaded, as after the menu's prewarm
+
+The "Do you want to play first?" dialog is answered yes without showing
+it, so no AI move is searched and only the start-up is measured. The
+prewarmed launch must stay under BUDGET_MS; the exit status is 1 if it
+does not. Needs a display.
+
+    python -m benchmarks.startup
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tkinter as tk
+from tkinter import messagebox
+
+from launcher import Launcher
+from menu import menu_structure
+
+SCRIPTS = [script for options in menu_structure.values() for script in options.values()]
+RUNS = 3
+BUDGET_MS = 100
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs a script as __main__, prints "ready" once its window is drawn, then closes it
+PROBE = """
+import runpy, sys, tkinter as tk
+from tkinter import messagebox
+messagebox.askyesno = lambda *args, **kwargs: True
+def ready(root, n=0):
+    root.update()
+    print("ready", flush=True)
+    root.destroy()
+tk.Tk.mainloop = ready
+script = sys.argv[1]
+sys.argv = [script]
+runpy.run_path(script, run_name="__main__")
+"""
+
+
+def subprocess_launch(script):
+    """Milliseconds from starting a new interpreter on the script to its drawn window"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", PROBE, script], cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if line.strip() == "ready":
+            elapsed = time.perf_counter() - start
+            break
+    else:
+        raise RuntimeError(f"{script} exited before its window was drawn")
+    process.wait()
+    return elapsed * 1000
+
+
+def in_process_launch(launcher, script):
+    """Milliseconds to open the script's game in a Toplevel and draw it"""
+    start = time.perf_counter()
+    window = launcher.open(script)
+    window.update()
+    elapsed = time.perf_counter() - start
+    window.destroy()
+    return elapsed * 1000
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Needs a display: {e}")
+        sys.exit(1)
+    root.withdraw()
+    messagebox.askyesno = lambda *args, **kwargs: True
+    launcher = Launcher(root, SCRIPTS)
+
+    print(f"{'Script':<36}{'Subprocess (ms)':>17}{'First launch (ms)':>19}{'Prewarmed (ms)':>16}")
+    rows = []
+    for script in SCRIPTS:
+        first = in_process_launch(launcher, script)
+        prewarmed = statistics.median(in_process_launch(launcher, script) for _ in range(RUNS))
+        spawned = statistics.median(subprocess_launch(script) for _ in range(RUNS))
+        rows.append((spawned, first, prewarmed))
+        print(f"{script:<36}{spawned:>17.1f}{first:>19.1f}{prewarmed:>16.1f}")
+    root.destroy()
+
+    spawned, first, prewarmed = (statistics.median(column) for column in zip(*rows))
+    print(f"{'Median':<36}{spawned:>17.1f}{first:>19.1f}{prewarmed:>16.1f}")
+    worst = max(row[2] for row in rows)
+    print(f"\nPrewarmed launch: {spawned / prewarmed:.0f}x faster than a subprocess, "
+          f"worst {worst:.1f} ms against a budget of {BUDGET_MS} ms")
+    sys.exit(0 if worst <= BUDGET_MS else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Every menu variant on the same corpus of positions, as JSON.
+
+The corpus is every position the AI (X) can face in the first plies of
+a game, with either side moving first: the empty board, then the
+positions after one human move, after an X and an O move, and so on up
+to ``--plies``. By default one position of each symmetry class is kept,
+since the variants do the same work on rotations and reflections;
+``--all`` keeps every one.
+
+Each variant plays X's move in every corpus position. A pass creates a
+new player and keeps it for the whole corpus, as a game keeps it for
+every move, so tables fill up as they would. ``--warmup`` passes are run
+and thrown away, then ``--reps`` passes are timed. Memory is measured
+in one more pass with tracemalloc on, so tracing does not slow the timed
+passes down: tracing is started once for the whole run, and the peak is
+reset before every move and read after it.
+
+The report gives, per variant, the nodes searched, the moves a rule
+chose without searching, the moves read from the opening book, the wall time of a pass (median of the reps),
+the p50 / p99 / max latency over every timed move and the peak traced
+memory of a move.
+
+    python -m benchmarks.suite > suite.json
+    python -m benchmarks.suite --variants minimax symmetry --reps 5 --output suite.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from engine import book, tablebase
+from engine.bitboard import CELLS, FULL, WINNING
+from engine.symmetry import canonical
+from engine.variants import MENU_LABELS, VARIANTS, create
+
+
+def corpus(plies, all_symmetries=False):
+    """(x, o) of every unfinished position with X to move within ``plies`` plies of the start"""
+    positions = set()
+    frontier = {(0, 0, True), (0, 0, False)}
+    for _ in range(plies + 1):
+        following = set()
+        for x, o, x_to_move in frontier:
+            if WINNING[x] or WINNING[o] or x | o == FULL:
+                continue
+            if x_to_move:
+                positions.add((x, o) if all_symmetries else canonical(x, o))
+            for cell in range(CELLS):
+                bit = 1 << cell
+                if not (x | o) & bit:
+                    following.add((x | bit, o, False) if x_to_move else (x, o | bit, True))
+        frontier = following
+    # Fewest pieces first, then by position, so every run plays them in the same order
+    return sorted(positions, key=lambda position: (bin(position[0] | position[1]).count('1'), position))
+
+
+def run_pass(name, positions, trace=False):
+    """
+    Latency in seconds and SearchStats of X's move in every position, with
+    a new player. If ``trace``, the peak memory tracemalloc traced over each
+    move the engine answered, by a search or the tablebase, goes in its stats.
+    """
+    player = create(name)
+    latencies = []
+    stats = []
+    for x, o in positions:
+        if trace:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        _, move_stats = player.move(x, o)
+        latencies.append(time.perf_counter() - start)
+        if trace and not (move_stats.rule or move_stats.book):
+            move_stats.peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+        stats.append(move_stats)
+    return latencies, stats
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(fraction * len(ordered))) - 1]
+
+
+def benchmark(name, positions, warmup, reps):
+    for _ in range(warmup):
+        run_pass(name, positions)
+    latencies = []
+    pass_times = []
+    for _ in range(reps):
+        pass_latencies, stats = run_pass(name, positions)
+        latencies.extend(pass_latencies)
+        pass_times.append(sum(pass_latencies))
+    tracemalloc.start()
+    try:
+        _, traced = run_pass(name, positions, trace=True)
+    finally:
+        tracemalloc.stop()
+    peaks = [move_stats.peak_memory for move_stats in traced if move_stats.peak_memory is not None]
+
+    # Counts come from the last timed pass; only the time-limited variants vary between passes
+    nodes = sum(move_stats.nodes for move_stats in stats)
+    return {
+        "label": MENU_LABELS[name],
+        "moves": len(positions),
+        "rule_moves": sum(1 for move_stats in stats if move_stats.rule),
+        "book_moves": sum(1 for move_stats in stats if move_stats.book),
+        "nodes": nodes,
+        "nodes_per_move": nodes / len(positions),
+        "cache_hits": sum(move_stats.cache_hits for move_stats in stats),
+        "wall_time_s": statistics.median(pass_times),
+        "latency_ms": {
+            "mean": statistics.fmean(latencies) * 1000,
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": max(latencies) * 1000,
+        },
+        "peak_memory_bytes": {
+            "max": max(peaks, default=0),
+            "mean": statistics.fmean(peaks) if peaks else 0,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--plies", type=int, default=4, help="plies from the start covered by the corpus")
+    parser.add_argument("--all", action="store_true", help="keep every position, not one per symmetry class")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed passes before the timed ones")
+    parser.add_argument("--reps", type=int, default=3, help="timed passes")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+    parser.add_argument("--output", help="write the JSON report here instead of to stdout")
+    args = parser.parse_args(argv)
+    if args.reps < 1:
+        parser.error("--reps must be at least 1")
+
+    positions = corpus(args.plies, args.all)
+    report = {
+        "corpus": {"plies": args.plies, "symmetry_reduced": not args.all, "positions": len(positions)},
+        "warmup": args.warmup,
+        "reps": args.reps,
+        "python": platform.python_version(),
+        "tablebase": tablebase.load() is not None,
+        "opening_book": book.load() is not None,
+        "variants": {},
+    }
+    for name in args.variants:
+        print(f"{MENU_LABELS[name]}...", file=sys.stderr)
+        report["variants"][name] = benchmark(name, positions, args.warmup, args.reps)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
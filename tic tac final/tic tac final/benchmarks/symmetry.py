@@ -0,0 +1,54 @@
+"""
+Node counts of plain minimax against minimax with symmetry reduction,
+with and without a table keyed on the symmetric Zobrist hash. The
+reduction stops past Negamax.SYMMETRY_PIECES pieces; the speedup is in
+wall-clock time, so it counts the cost of the 8 hashes per node.
+
+    python -m benchmarks.symmetry
+"""
+
+import time
+
+from engine.bitboard import CELL_BITS
+from engine.search import Negamax
+from engine.transposition import TranspositionTable
+
+# (name, x, o, x_to_move)
+POSITIONS = [
+    ("Empty board, AI first", 0, 0, True),
+    ("Empty board, human first", 0, 0, False),
+    ("AI in the center", CELL_BITS[4], 0, False),
+    ("AI in a corner", CELL_BITS[0], 0, False),
+    ("AI on an edge", CELL_BITS[1], 0, False),
+    ("Corner vs center", CELL_BITS[0], CELL_BITS[4], True),
+]
+
+
+def count_nodes(engine, x, o, x_to_move):
+    """Value, visited nodes and seconds for one search from the position"""
+    start = time.perf_counter()
+    result = engine.search(x, o, x_to_move)
+    elapsed = time.perf_counter() - start
+    return result.value, result.stats.nodes, elapsed
+
+
+def main():
+    print(f"{'Position':<28}{'Minimax':>12}{'Symmetry':>12}{'Reduction':>12}{'Speedup':>10}{'Cached':>10}")
+    total_plain = total_symmetric = total_cached = 0
+    for label, x, o, x_to_move in POSITIONS:
+        plain_value, plain_nodes, plain_time = count_nodes(Negamax(alphabeta=False), x, o, x_to_move)
+        sym_value, sym_nodes, sym_time = count_nodes(Negamax(alphabeta=False, symmetry=True), x, o, x_to_move)
+        cached = Negamax(alphabeta=False, symmetry=True, table=TranspositionTable())
+        cached_value, cached_nodes, _ = count_nodes(cached, x, o, x_to_move)
+        assert plain_value == sym_value == cached_value, label
+        total_plain += plain_nodes
+        total_symmetric += sym_nodes
+        total_cached += cached_nodes
+        print(f"{label:<28}{plain_nodes:>12}{sym_nodes:>12}"
+              f"{1 - sym_nodes / plain_nodes:>12.1%}{plain_time / sym_time:>9.1f}x{cached_nodes:>10}")
+    print(f"{'Total':<28}{total_plain:>12}{total_symmetric:>12}"
+          f"{1 - total_symmetric / total_plain:>12.1%}{'':>10}{total_cached:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Cost of the terminal test per board size.
+
+Plays random games on square boards and times, after every move, the
+full rescan of every win line (Board.is_win) against the test of the
+lines through the last move only (Board.wins_with). Both must agree on
+every move.
+
+    python -m benchmarks.terminal
+"""
+
+import random
+import time
+
+from engine.nxn import Board
+
+# (size, win length)
+BOARDS = [(3, 3), (4, 4), (5, 4), (6, 5), (8, 5), (10, 5), (15, 5)]
+GAMES = 200
+
+
+def random_moves(board, rng):
+    """(mask of the mover, bit played) after every move of a random game, stopping at the first win"""
+    masks = [0, 0]
+    cells = list(range(board.cells))
+    rng.shuffle(cells)
+    moves = []
+    for ply, cell in enumerate(cells):
+        masks[ply % 2] |= 1 << cell
+        moves.append((masks[ply % 2], 1 << cell))
+        if board.wins_with(masks[ply % 2], 1 << cell):
+            break
+    return moves
+
+
+def per_call(test, moves):
+    """Nanoseconds per terminal test"""
+    start = time.perf_counter()
+    for mask, bit in moves:
+        test(mask, bit)
+    return (time.perf_counter() - start) / len(moves) * 1e9
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'Board':<12}{'Lines':>7}{'Through cell':>14}{'Rescan (ns)':>13}{'Last move (ns)':>16}{'Speedup':>9}")
+    for size, k in BOARDS:
+        board = Board(size, size, k)
+        moves = [move for _ in range(GAMES) for move in random_moves(board, rng)]
+        assert all(board.is_win(mask) == board.wins_with(mask, bit) for mask, bit in moves)
+        rescan = per_call(lambda mask, bit: board.is_win(mask), moves)
+        last_move = per_call(board.wins_with, moves)
+        through = max(len(lines) for lines in board.lines_through.values())
+        print(f"{f'{size}x{size}, k={k}':<12}{len(board.lines):>7}{through:>14}"
+              f"{rescan:>13.0f}{last_move:>16.0f}{rescan / last_move:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Short-circuit rate of the threat-space search and the think time it saves.
+
+On every board the heuristic strategy plays ``--games`` games from each
+side against the heuristic strategy without the threat-space search,
+once searching every move itself and once trying the threat-space
+search first. Both sides play ``--random`` random moves each to open,
+the same ones in both runs, so that the games differ; after those the
+searches are time limited, so the two runs need not play the same game.
+
+The report gives, per board, the moves the threat-space search was
+asked for, the forced wins it found, each of which cut the main search
+off, and its share; the mean time of one threat-space search; the mean
+think time of a game without and with it, and the score of the player
+in both runs (wins minus losses per game) to show the moves it plays
+are no worse.
+
+    python -m benchmarks.threats
+    python -m benchmarks.threats --games 5 --seed 1
+"""
+
+import argparse
+import random
+import time
+
+from engine.nxn import Board, create
+
+# (rows, cols, win length)
+BOARDS = [(7, 7, 4), (7, 7, 5), (9, 9, 5)]
+
+
+def play(board, player, opponent, seed, first, openings):
+    """Seconds the player thought over one game, and its result: 1 won, 0 drawn, -1 lost"""
+    rng = random.Random(seed)
+    own = other = 0
+    own_to_move = first
+    think = 0.0
+    ply = 0
+    while True:
+        if board.is_win(own) or board.is_win(other) or own | other == board.full:
+            return think, board.is_win(own) - board.is_win(other)
+        if ply < 2 * openings:
+            cell = rng.choice(board.empty_cells(own, other))
+        elif own_to_move:
+            start = time.perf_counter()
+            cell, _ = player.move(own, other)
+            think += time.perf_counter() - start
+        else:
+            cell, _ = opponent.move(other, own)
+        if own_to_move:
+            own |= 1 << cell
+        else:
+            other |= 1 << cell
+        own_to_move = not own_to_move
+        ply += 1
+
+
+def run(board, threats, games, seed, openings):
+    """Mean seconds per game and score per game over every game from both sides, and the threat-space search"""
+    player = create("heuristic", board, threats=threats)
+    opponent = create("heuristic", board, threats=False)
+    total = score = 0.0
+    for game in range(games):
+        for first in (True, False):
+            game_time, result = play(board, player, opponent, seed + game, first, openings)
+            total += game_time
+            score += result
+    count = 2 * games
+    return total / count, score / count, player.rules[0] if player.rules else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=3, help="games per side")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random opening moves")
+    parser.add_argument("--random", type=int, default=2, help="random opening moves of each side")
+    args = parser.parse_args(argv)
+
+    print(f"{args.games} games per side, {args.random} random opening moves each\n")
+    print(f"{'Board':<14}{'Probes':>8}{'Hits':>6}{'Rate':>7}{'Threats (ms)':>14}"
+          f"{'Search (ms/game)':>18}{'Threats (ms/game)':>19}{'Saved':>8}{'Score':>8}{'Score with':>12}")
+    for rows, cols, k in BOARDS:
+        board = Board(rows, cols, k)
+        search_game, search_score, _ = run(board, False, args.games, args.seed, args.random)
+        threats_game, threats_score, threats = run(board, True, args.games, args.seed, args.random)
+        per_probe = threats.seconds / threats.probes if threats.probes else 0.0
+        saved = 1 - threats_game / search_game if search_game else 0.0
+        print(f"{f'{rows}x{cols}, k={k}':<14}{threats.probes:>8}{threats.hits:>6}{threats.hit_rate:>7.0%}"
+              f"{per_probe * 1000:>14.2f}{search_game * 1000:>18.0f}{threats_game * 1000:>19.0f}{saved:>8.0%}"
+              f"{search_score:>+8.2f}{threats_score:>+12.2f}")
+
+
+if __name__ == "__main__":
+    main()
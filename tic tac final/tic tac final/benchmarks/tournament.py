@@ -0,0 +1,121 @@
+"""
+Round-robin self-play between every menu variant, the Galaxy Mode AI
+and the proof-number solver.
+
+Every entrant plays every other one from both sides, ``--games`` games
+per pairing and side, on a process pool. Each game gets new players,
+as a new game window would. A player always sees its own pieces as X
+(the AI's side in every variant), so any entrant can play either side;
+the one moving first is listed first.
+
+The report gives each entrant's wins, draws and losses, the results of
+every pairing, its mean think time per move when moving first and
+second, and the games played per second of wall time. The time-limited
+heuristic variants think less deeply when the workers share cores.
+
+    python -m benchmarks.tournament
+    python -m benchmarks.tournament --games 4 --workers 8
+"""
+
+import argparse
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.bitboard import FULL, WINNING
+from engine.galaxy import GalaxyPlayer
+from engine.nxn import Board
+from engine.nxn import create as create_board_player
+from engine.variants import MENU_LABELS, create
+
+# name -> (label, player factory taking the game's random seed)
+ENTRANTS = {name: (label, lambda seed, name=name: create(name)) for name, label in MENU_LABELS.items()}
+ENTRANTS["galaxy"] = ("Galaxy Mode (tic-tac-toe 2)", lambda seed: GalaxyPlayer(random.Random(seed)))
+ENTRANTS["proof"] = ("Proof-number solver", lambda seed: create_board_player("proof", Board(3, 3, 3)))
+
+WIN, DRAW, LOSS = "W", "D", "L"
+
+
+def play(first, second, seed):
+    """
+    Result of one game for ``first``, which moves first, and the seconds
+    and moves each side spent thinking.
+    """
+    names = (first, second)
+    players = (ENTRANTS[first][1](seed), ENTRANTS[second][1](seed + 1))
+    pieces = [0, 0]
+    think = [0.0, 0.0]
+    moves = [0, 0]
+    side = 0
+    while True:
+        own, other = pieces[side], pieces[1 - side]
+        start = time.perf_counter()
+        cell, _ = players[side].move(own, other)
+        think[side] += time.perf_counter() - start
+        moves[side] += 1
+        if cell is None or (own | other) >> cell & 1:
+            raise RuntimeError(f"{names[side]} played {cell} in x={own:09b} o={other:09b}")
+        pieces[side] |= 1 << cell
+        if WINNING[pieces[side]]:
+            return (WIN if side == 0 else LOSS), think, moves
+        if pieces[0] | pieces[1] == FULL:
+            return DRAW, think, moves
+        side = 1 - side
+
+
+def play_pairing(first, second, games, seed):
+    return first, second, [play(first, second, seed + 2 * game) for game in range(games)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=2, help="games per pairing and side")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes in the pool")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random openings")
+    args = parser.parse_args(argv)
+
+    names = list(ENTRANTS)
+    pairings = list(itertools.permutations(names, 2))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as pool:
+        results = list(pool.map(play_pairing, *zip(*pairings), itertools.repeat(args.games),
+                                itertools.repeat(args.seed)))
+    elapsed = time.perf_counter() - start
+
+    # Per entrant: W/D/L counts, per opponent W/D/L counts, and (seconds, moves) moving first and second
+    totals = {name: {WIN: 0, DRAW: 0, LOSS: 0} for name in names}
+    table = {name: {opponent: {WIN: 0, DRAW: 0, LOSS: 0} for opponent in names} for name in names}
+    think = {name: [[0.0, 0], [0.0, 0]] for name in names}
+    flip = {WIN: LOSS, DRAW: DRAW, LOSS: WIN}
+    games = 0
+    for first, second, outcomes in results:
+        for result, seconds, moves in outcomes:
+            games += 1
+            for side, name, opponent, own_result in ((0, first, second, result), (1, second, first, flip[result])):
+                totals[name][own_result] += 1
+                table[name][opponent][own_result] += 1
+                think[name][side][0] += seconds[side]
+                think[name][side][1] += moves[side]
+
+    print(f"{games} games in {elapsed:.1f} s with {args.workers} workers: {games / elapsed:.1f} games/s\n")
+    print(f"{'Entrant':<44}{'W':>5}{'D':>5}{'L':>5}{'First (ms/move)':>17}{'Second (ms/move)':>18}")
+    for name in sorted(names, key=lambda name: (-totals[name][WIN] + totals[name][LOSS], name)):
+        first_ms, second_ms = (seconds / moves * 1000 if moves else 0.0 for seconds, moves in think[name])
+        print(f"{ENTRANTS[name][0]:<44}{totals[name][WIN]:>5}{totals[name][DRAW]:>5}{totals[name][LOSS]:>5}"
+              f"{first_ms:>17.2f}{second_ms:>18.2f}")
+
+    print("\nW-D-L of the row entrant against the column entrant, both sides")
+    width = max(len(f"{index} {name}") for index, name in enumerate(names)) + 2
+    print(f"{'':<{width}}" + "".join(f"{index:>8}" for index in range(len(names))))
+    for index, name in enumerate(names):
+        cells = "".join(
+            f"{'-':>8}" if opponent == name else
+            f"{'{W}-{D}-{L}'.format(**table[name][opponent]):>8}"
+            for opponent in names)
+        print(f"{f'{index} {name}':<{width}}{cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -192,10 +192,14 @@
 import tkinter as tk
 from tkinter import messagebox
 import time
-import matplotlib.pyplot as plt
 import math
+import os
 import sys
 
+# stats_plot lives one folder up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stats_plot import pyplot, show
+
 class TicTacToe:
     def __init__(self, master):
         self.buttons = [[0 for _ in range(3)] for _ in range(3)]
@@ -358,6 +362,7 @@ class TicTacToe:
 
     def calculate_and_show_plot(self):
         # Plot the results
+        plt = pyplot()
         moves = list(range(1, len(self.execution_times) + 1))
         plt.plot(moves, self.execution_times, marker='o', label='Time Complexity')
         plt.plot(moves, self.space_complexity, marker='o', label='Space Complexity')  # added
@@ -365,7 +370,7 @@ class TicTacToe:
         plt.ylabel('Complexity')
         plt.title('Time and Space Complexity Analysis for Each AI Move')
         plt.legend()
-        plt.show()
+        show(plt, "complexity.png")
 
         # Calculate and print the average time complexity
         average_time_complexity = sum(self.execution_times) / len(self.execution_times)
@@ -2,8 +2,17 @@
 import tkinter as tk
 from tkinter import messagebox
 import time
-import matplotlib.pyplot as plt
 import math
+import os
+import sys
+
+# The engine package lives one folder up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine.nxn import Board, BoardNegamax
+from stats_plot import pyplot, show
+
+# Plies searched per move by calculate_time_complexity
+COMPLEXITY_DEPTH = 3
 
 class TicTacToe:
     def __init__(self, master):
@@ -161,40 +170,48 @@ class TicTacToe:
             self.choose_starting_player()
 
     def calculate_time_complexity(self, board_size, num_simulations):  # Modified
+        # The 3x3 methods above cannot search a larger board, so every size is
+        # searched by the N x N engine: minimax with the corner heuristic,
+        # COMPLEXITY_DEPTH plies deep, since a full search is out of reach past 3x3
         input_sizes = list(range(3, board_size + 1))
-        execution_times = []
+        average_times = []
 
         for size in input_sizes:
-            self.board = [['-' for _ in range(size)] for _ in range(size)]
+            board = Board(size, size, size)
+            engine = BoardNegamax(board, board.corner_control, max_depth=COMPLEXITY_DEPTH - 1, alphabeta=False)
+            execution_times = []
 
             for _ in range(num_simulations):  # Added
-                # Measure execution time for the ai_move_with_corners function - Modified
                 start_time = time.time()
-                self.ai_move_with_corners()
+                result = engine.search(0, 0)
                 end_time = time.time()
                 execution_time = end_time - start_time
                 execution_times.append(execution_time)
-                print(f"Board Size: {size}x{size}, Execution Time: {execution_time} seconds")
+                print(f"Board Size: {size}x{size}, Execution Time: {execution_time} seconds, Search: {result.stats}")
+
+            average_times.append(sum(execution_times) / len(execution_times))
 
         # Plot the results - Modified
-        plt.plot(range(1, num_simulations + 1), execution_times, marker='o')  # Modified
-        plt.xlabel('AI Moves')  # Modified
-        plt.ylabel('Execution Time (s)')  # Modified
+        plt = pyplot()
+        plt.plot(input_sizes, average_times, marker='o')  # Modified
+        plt.xlabel('Board Size (N x N)')  # Modified
+        plt.ylabel('Average Execution Time (s)')  # Modified
         plt.title('Time Complexity Analysis (Corner Control Heuristic)')  # Modified
-        plt.show()
+        show(plt, "time_complexity.png")
 
         # Calculate and print the average time complexity - Added
-        average_time_complexity = sum(execution_times) / len(execution_times)
+        average_time_complexity = sum(average_times) / len(average_times)
         print(f"Average Time Complexity: {average_time_complexity} seconds")  # Added
 
     def calculate_and_show_plot(self):
         # Plot the results
+        plt = pyplot()
         moves = list(range(1, len(self.execution_times) + 1))
         plt.plot(moves, self.execution_times, marker='o')
         plt.xlabel('AI Moves')
         plt.ylabel('Execution Time (s)')
         plt.title('Time Complexity Analysis for Each AI Move')
-        plt.show()
+        show(plt, "complexity.png")
 
         # Calculate and print the average time complexity
         average_time_complexity = sum(self.execution_times) / len(self.execution_times)
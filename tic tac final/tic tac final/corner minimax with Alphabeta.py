@@ -1,9 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
 import time
-import matplotlib.pyplot as plt
-import math
+from ai_worker import AIWorker
+from stats_plot import show_search_stats
 from styled_wrapper import create_styled_game
+from engine.bitboard import cell_position, from_board
+from engine.evaluation import corner_control
+from engine.variants import create
 
 
 class TicTacToe:
@@ -16,8 +19,11 @@ class TicTacToe:
 
         self.buttons = [[0 for _ in range(3)] for _ in range(3)]
         self.board = [['-' for _ in range(3)] for _ in range(3)]
+        self.player = create("corner_alpha_beta")
+        self.worker = AIWorker(master, self.player)
         self.current_player = None  # Initialize to None, will be set after asking the user
         self.execution_times = []  # Added
+        self.search_stats = []
 
         for i in range(3):
             for j in range(3):
@@ -39,99 +45,20 @@ class TicTacToe:
             self.ai_move_with_alpha_beta()
 
     def evaluate(self, board):
-        for row in board:
-            if row.count('X') == 3:
-                return 10
-            elif row.count('O') == 3:
-                return -10
-
-        for col in range(3):
-            if board[0][col] == board[1][col] == board[2][col]:
-                if board[0][col] == 'X':
-                    return 10
-                elif board[0][col] == 'O':
-                    return -10
-
-        if board[0][0] == board[1][1] == board[2][2]:
-            if board[0][0] == 'X':
-                return 10
-            elif board[0][0] == 'O':
-                return -10
-
-        if board[0][2] == board[1][1] == board[2][0]:
-            if board[0][2] == 'X':
-                return 10
-            elif board[0][2] == 'O':
-                return -10
-
-        corner_control = 0
-        corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
-        for corner in corners:
-            if board[corner[0]][corner[1]] == 'X':
-                corner_control += 1
-            elif board[corner[0]][corner[1]] == 'O':
-                corner_control -= 1
-
-        return corner_control
-
-    def minimax_with_alpha_beta(self, board, depth, is_maximizing, alpha, beta):
-        score = self.evaluate(board)
-        if score == 10:
-            return score - depth
-        if score == -10:
-            return score + depth
-        if not any('-' in row for row in board):
-            return 0
-
-        if is_maximizing:
-            best = -math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'X'
-                        val = self.minimax_with_alpha_beta(board, depth + 1, False, alpha, beta)
-                        best = max(best, val)
-                        alpha = max(alpha, best)
-                        board[i][j] = '-'
-                        if beta <= alpha:
-                            break  # Beta cutoff
-                if beta <= alpha:
-                    break
-            return best
-        else:
-            best = math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'O'
-                        val = self.minimax_with_alpha_beta(board, depth + 1, True, alpha, beta)
-                        best = min(best, val)
-                        beta = min(beta, best)
-                        board[i][j] = '-'
-                        if beta <= alpha:
-                            break  # Alpha cutoff
-                if beta <= alpha:
-                    break
-            return best
+        x, o = from_board(board)
+        return corner_control(x, o)
 
     def ai_move_with_alpha_beta(self):
-        start_time = time.time()
-
-        best_val = -math.inf
-        best_move = (-1, -1)
-
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == '-':
-                    self.board[i][j] = 'X'
-                    move_val = self.minimax_with_alpha_beta(self.board, 0, False, -math.inf, math.inf) + self.evaluate(self.board)
-                    self.board[i][j] = '-'
+        self.move_start_time = time.time()
+        self.current_player = 'X'
 
-                    if move_val > best_val:
-                        best_move = (i, j)
-                        best_val = move_val
+        x, o = from_board(self.board)
+        self.worker.start(x, o, self.place_ai_move)
 
-        row, col = best_move
+    def place_ai_move(self, cell, stats):
+        start_time = self.move_start_time
+        lag = self.worker.lags[-1]
+        row, col = cell_position(cell)
         self.buttons[row][col].config(text='X', state=tk.DISABLED)
         self.board[row][col] = 'X'
 
@@ -150,10 +77,15 @@ class TicTacToe:
         end_time = time.time()
         execution_time = end_time - start_time
         self.execution_times.append(execution_time)
+        self.search_stats.append(stats)
         print(f"AI Move Execution Time: {execution_time} seconds")
+        print(f"Search: {stats}")
+        print(f"Event Loop Lag: {lag * 1000:.1f} ms")
+        print(f"Transposition Table: {self.player.engine.table}")
+        print(f"Move Ordering: {self.player.engine.ordering}")
 
     def on_click(self, row, col):
-        if self.board[row][col] == '-':
+        if self.board[row][col] == '-' and self.current_player == 'O':
             self.buttons[row][col].config(text='O', state=tk.DISABLED)
             self.board[row][col] = 'O'
 
@@ -171,6 +103,7 @@ class TicTacToe:
                 self.reset_board()
 
     def reset_board(self):
+        self.worker.cancel()
         play_again = messagebox.askyesno("Tic Tac Toe", "Do you want to play again?")
         if play_again:
             for i in range(3):
@@ -182,15 +115,7 @@ class TicTacToe:
             self.choose_starting_player()
 
     def calculate_and_show_plot(self):
-        moves = list(range(1, len(self.execution_times) + 1))
-        plt.plot(moves, self.execution_times, marker='o')
-        plt.xlabel('AI Moves')
-        plt.ylabel('Execution Time (s)')
-        plt.title('Time Complexity Analysis for Each AI Move')
-        plt.show()
-
-        average_time_complexity = sum(self.execution_times) / len(self.execution_times)
-        print(f"Average Time Complexity: {average_time_complexity} seconds")
+        show_search_stats(self.execution_times, self.search_stats)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
 import time
-import matplotlib.pyplot as plt
-import math
-import sys
+from ai_worker import AIWorker
+from stats_plot import show_search_stats
 from styled_wrapper import create_styled_game
+from engine.bitboard import cell_position, from_board
+from engine.evaluation import corner_defense
+from engine.variants import create
 
 class TicTacToe:
     def __init__(self, master):
@@ -18,9 +20,11 @@ class TicTacToe:
 
         self.buttons = [[0 for _ in range(3)] for _ in range(3)]
         self.board = [['-' for _ in range(3)] for _ in range(3)]
+        self.player = create("corner_minimax")
+        self.worker = AIWorker(master, self.player)
         self.current_player = self.choose_starting_player()
         self.execution_times = []
-        self.space_complexity = []
+        self.search_stats = []
 
         for i in range(3):
             for j in range(3):
@@ -29,7 +33,7 @@ class TicTacToe:
                 self.buttons[i][j].grid(row=i, column=j)
 
         # Create calculate button but don't add it to layout - styled wrapper will handle this
-        self.calculate_button = tk.Button(master, text="Calculate Time Complexity and Space Complexity", command=self.calculate_and_show_plot)
+        self.calculate_button = tk.Button(master, text="Calculate Time Complexity", command=self.calculate_and_show_plot)
         # Removed: self.calculate_button.grid(row=3, column=0, columnspan=3)
 
         if self.current_player == 'X':
@@ -40,164 +44,20 @@ class TicTacToe:
         return 'O' if result else 'X'
 
     def evaluate(self, board):
-        # Check for win conditions
-        for row in board:
-            if row.count('X') == 3:
-                return 10
-            elif row.count('O') == 3:
-                return -10
-
-        for col in range(3):
-            if board[0][col] == board[1][col] == board[2][col]:
-                if board[0][col] == 'X':
-                    return 10
-                elif board[0][col] == 'O':
-                    return -10
-
-        if board[0][0] == board[1][1] == board[2][2]:
-            if board[0][0] == 'X':
-                return 10
-            elif board[0][0] == 'O':
-                return -10
-
-        if board[0][2] == board[1][1] == board[2][0]:
-            if board[0][2] == 'X':
-                return 10
-            elif board[0][2] == 'O':
-                return -10
-
-        # Corner control heuristic with higher weight
-        corner_control = 0
-        corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
-        for i, j in corners:
-            if board[i][j] == 'X':
-                corner_control += 2  # Increased weight for AI corners
-            if board[i][j] == 'O':
-                corner_control -= 1
-                
-        # Block potential winning moves
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == '-':
-                    # Check if player could win here
-                    board[i][j] = 'O'
-                    if self.check_win(board, 'O'):
-                        corner_control -= 5  # High penalty for allowing win
-                    board[i][j] = '-'
-                    
-        return corner_control
-
-    def check_win(self, board, player):
-        # Check rows
-        for row in board:
-            if row.count(player) == 3:
-                return True
-                
-        # Check columns
-        for col in range(3):
-            if board[0][col] == board[1][col] == board[2][col] == player:
-                return True
-                
-        # Check diagonals
-        if board[0][0] == board[1][1] == board[2][2] == player:
-            return True
-        if board[0][2] == board[1][1] == board[2][0] == player:
-            return True
-            
-        return False
-
-    def minimax_with_corner(self, board, depth, is_maximizing):
-        """Enhanced minimax to ensure AI doesn't lose"""
-        score = self.evaluate(board)
-        
-        # Terminal states
-        if score == 10:  # AI wins
-            return score - depth
-        if score == -10:  # Player wins
-            return score + depth
-        if not any('-' in row for row in board):  # Draw
-            return 0
-            
-        if is_maximizing:
-            best = -math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'X'
-                        best = max(best, self.minimax_with_corner(board, depth + 1, False))
-                        board[i][j] = '-'
-            return best
-        else:
-            best = math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'O'
-                        best = min(best, self.minimax_with_corner(board, depth + 1, True))
-                        board[i][j] = '-'
-            return best
+        x, o = from_board(board)
+        return corner_defense(x, o)
 
     def ai_move_with_corner(self):
-        start_time = time.time()
-        
-        # First priority: Take a corner if available
-        corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
-        corner_available = False
-        
-        # First check if AI can win in one move
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == '-':
-                    self.board[i][j] = 'X'
-                    if self.check_win(self.board, 'X'):
-                        row, col = i, j
-                        self.board[i][j] = '-'
-                        corner_available = True
-                        break
-                    self.board[i][j] = '-'
-            if corner_available:
-                break
-                
-        # If no winning move, check if need to block player
-        if not corner_available:
-            for i in range(3):
-                for j in range(3):
-                    if self.board[i][j] == '-':
-                        self.board[i][j] = 'O'
-                        if self.check_win(self.board, 'O'):
-                            row, col = i, j
-                            self.board[i][j] = '-'
-                            corner_available = True
-                            break
-                        self.board[i][j] = '-'
-                if corner_available:
-                    break
-        
-        # If no immediate win or block needed, try to take a corner
-        if not corner_available:
-            for i, j in corners:
-                if self.board[i][j] == '-':
-                    corner_available = True
-                    row, col = i, j
-                    break
-        
-        # If no corner is available, use minimax to find best move
-        if not corner_available:
-            best_val = -math.inf
-            best_move = (-1, -1)
+        self.move_start_time = time.time()
+        self.current_player = 'X'
 
-            for i in range(3):
-                for j in range(3):
-                    if self.board[i][j] == '-':
-                        self.board[i][j] = 'X'
-                        move_val = self.minimax_with_corner(self.board, 0, False) + self.evaluate(self.board)
-                        self.board[i][j] = '-'
-
-                        if move_val > best_val:
-                            best_move = (i, j)
-                            best_val = move_val
+        x, o = from_board(self.board)
+        self.worker.start(x, o, self.place_ai_move)
 
-            row, col = best_move
+    def place_ai_move(self, cell, stats):
+        start_time = self.move_start_time
+        lag = self.worker.lags[-1]
+        row, col = cell_position(cell)
 
         self.buttons[row][col].config(text='X', state=tk.DISABLED)
         self.board[row][col] = 'X'
@@ -217,11 +77,11 @@ class TicTacToe:
         end_time = time.time()
         execution_time = end_time - start_time
         self.execution_times.append(execution_time)
+        self.search_stats.append(stats)
 
-        space_used = sys.getsizeof(self.board)
-        self.space_complexity.append(space_used)
-
-        print(f"AI Move Execution Time: {execution_time} seconds, Space Complexity: {space_used} bytes")
+        print(f"AI Move Execution Time: {execution_time} seconds")
+        print(f"Search: {stats}")
+        print(f"Event Loop Lag: {lag * 1000:.1f} ms")
 
     def on_click(self, row, col):
         if self.board[row][col] == '-' and self.current_player == 'O':
@@ -245,6 +105,7 @@ class TicTacToe:
 
 
     def reset_board(self):
+        self.worker.cancel()
         play_again = messagebox.askyesno("Tic Tac Toe", "Do you want to play again?")
         if play_again:
             for i in range(3):
@@ -257,20 +118,7 @@ class TicTacToe:
                 self.ai_move_with_corner()
 
     def calculate_and_show_plot(self):
-        moves = list(range(1, len(self.execution_times) + 1))
-        plt.plot(moves, self.execution_times, marker='o', label='Time Complexity')
-        plt.plot(moves, self.space_complexity, marker='o', label='Space Complexity')
-        plt.xlabel('AI Moves')
-        plt.ylabel('Complexity')
-        plt.title('Time and Space Complexity Analysis for Each AI Move')
-        plt.legend()
-        plt.show()
-
-        average_time_complexity = sum(self.execution_times) / len(self.execution_times)
-        print(f"Average Time Complexity: {average_time_complexity} seconds")
-
-        average_space_complexity = sum(self.space_complexity) / len(self.space_complexity)
-        print(f"Average Space Complexity: {average_space_complexity} bytes")
+        show_search_stats(self.execution_times, self.search_stats)
 
 if __name__ == "__main__":
     root = tk.Tk()
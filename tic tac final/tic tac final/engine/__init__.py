@@ -0,0 +1,22 @@
+"""
+Shared position engine for the Tic Tac Toe variants.
+
+The board is stored as two bitboards, one 9-bit integer per side, so the
+searches never touch the list-of-lists board used by the GUI.
+"""
+
+from engine.bitboard import (
+    CELL_BITS,
+    FULL,
+    WIN_MASKS,
+    cell_index,
+    cell_position,
+    empty_cells,
+    evaluate,
+    from_board,
+    is_win,
+)
+from engine.evaluation import center_control, corner_control, corner_defense, line_potential, threat_score
+from engine.ordering import MoveOrdering
+from engine.search import Negamax, SearchCancelled, SearchResult, SearchStats
+from engine.transposition import TranspositionTable
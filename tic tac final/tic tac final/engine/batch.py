@@ -0,0 +1,96 @@
+"""
+Evaluation of many positions at once with NumPy.
+
+Positions are the rows of an (M, cells) int8 array holding X (1), O (-1)
+or 0 for an empty cell, cells in row-major order as on the bitboards.
+The board's win lines, the same Board.lines the searches use, become a
+(lines, k) matrix of cell indices; indexing the positions with it
+gathers every line of every position into one (M, lines, k) array, and
+the per-line X and O counts, the wins and the heuristic are reductions
+over its axes:
+
+    from engine.batch import evaluate_batch
+    result = evaluate_batch(positions)
+    result.terminal, result.winner, result.heuristic
+
+The scores agree with the scalar evaluations, engine.evaluation on 3x3
+and Board's on other boards. NumPy is imported by this module only; the
+engine package does not load it, so the games never pay for it.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from engine.nxn import Board
+
+X = 1
+O = -1
+
+# Rows evaluated per pass, which bounds the (rows, lines, k) gather
+CHUNK = 65536
+
+HEURISTICS = ("threat_score", "line_potential")
+
+BatchResult = namedtuple("BatchResult", ["terminal", "winner", "heuristic"])
+
+DEFAULT_BOARD = Board(3, 3, 3)
+
+
+@lru_cache(maxsize=None)
+def line_matrix(board):
+    """(lines, k) cell indices of the board's win lines, in Board.lines order"""
+    return np.array(
+        [[cell for cell in range(board.cells) if line >> cell & 1] for line in board.lines], dtype=np.intp)
+
+
+def to_array(positions, board=DEFAULT_BOARD):
+    """(M, cells) int8 array of a sequence of (x, o) bitboard pairs"""
+    cells = range(board.cells)
+    rows = [[(x >> cell & 1) * X + (o >> cell & 1) * O for cell in cells] for x, o in positions]
+    return np.array(rows, dtype=np.int8).reshape(len(rows), board.cells)
+
+
+def evaluate_batch(positions, board=DEFAULT_BOARD, heuristic="threat_score"):
+    """
+    BatchResult of arrays with one entry per row of ``positions``:
+    terminal (bool) is whether the game is over, winner (int8) is X, O
+    or 0, and heuristic (int32) is the ``heuristic`` evaluation, from X's
+    point of view as in engine.evaluation. As in the scalar evaluate, a
+    row where both sides have a line counts as an X win.
+    """
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"Unknown heuristic {heuristic!r}, expected one of {', '.join(HEURISTICS)}")
+    positions = np.asarray(positions, dtype=np.int8)
+    if positions.ndim != 2 or positions.shape[1] != board.cells:
+        raise ValueError(f"Expected an (M, {board.cells}) array for {board!r}, got shape {positions.shape}")
+
+    lines = line_matrix(board)
+    k = board.k
+    count = len(positions)
+    terminal = np.empty(count, dtype=bool)
+    winner = np.empty(count, dtype=np.int8)
+    scores = np.empty(count, dtype=np.int32)
+    for start in range(0, count, CHUNK):
+        chunk = positions[start:start + CHUNK]
+        stop = start + len(chunk)
+        values = chunk[:, lines]
+        x_counts = np.count_nonzero(values == X, axis=2)
+        o_counts = np.count_nonzero(values == O, axis=2)
+        # A line is open for a side while the other has no piece on it
+        x_open = o_counts == 0
+        o_open = x_counts == 0
+
+        x_won = (x_counts == k).any(axis=1)
+        o_won = (o_counts == k).any(axis=1)
+        winner[start:stop] = np.where(x_won, X, np.where(o_won, O, 0))
+        terminal[start:stop] = x_won | o_won | (chunk != 0).all(axis=1)
+
+        if heuristic == "threat_score":
+            scores[start:stop] = 5 * (np.count_nonzero(x_open & (x_counts == k - 1), axis=1)
+                                      - np.count_nonzero(o_open & (o_counts == k - 1), axis=1))
+        else:
+            scores[start:stop] = (np.where(x_open, x_counts, 0).sum(axis=1)
+                                  - np.where(o_open, o_counts, 0).sum(axis=1))
+    return BatchResult(terminal, winner, scores)
@@ -0,0 +1,69 @@
+"""
+Bitboard representation of the 3x3 board.
+
+Each side is a 9-bit integer where bit ``row * 3 + col`` is set when that
+side owns the cell. X is the AI (maximizing) and O the human, as in the
+GUI variants.
+"""
+
+SIZE = 3
+CELLS = SIZE * SIZE
+FULL = (1 << CELLS) - 1
+
+# Bit of every cell in row-major order, the order the variants search in
+CELL_BITS = tuple(1 << cell for cell in range(CELLS))
+
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # Rows
+    0b001001001, 0b010010010, 0b100100100,  # Columns
+    0b100010001, 0b001010100,               # Diagonals
+)
+
+# Win test for every possible 9-bit mask, built once from the 8 lines
+WINNING = tuple(
+    any(mask & line == line for line in WIN_MASKS) for mask in range(1 << CELLS)
+)
+
+POPCOUNT = tuple(bin(mask).count('1') for mask in range(1 << CELLS))
+
+
+def cell_index(row, col):
+    """Bit index of a (row, col) cell"""
+    return row * SIZE + col
+
+
+def cell_position(cell):
+    """(row, col) of a bit index"""
+    return divmod(cell, SIZE)
+
+
+def from_board(board):
+    """Convert a 3x3 list board ('X', 'O', '-' or '') to (x, o) bitboards"""
+    x = o = 0
+    for i, row in enumerate(board):
+        for j, value in enumerate(row):
+            if value == 'X':
+                x |= CELL_BITS[i * SIZE + j]
+            elif value == 'O':
+                o |= CELL_BITS[i * SIZE + j]
+    return x, o
+
+
+def is_win(mask):
+    """True if the side owning ``mask`` has three in a row"""
+    return WINNING[mask]
+
+
+def evaluate(x, o):
+    """10 if X has won, -10 if O has won, 0 otherwise"""
+    if WINNING[x]:
+        return 10
+    if WINNING[o]:
+        return -10
+    return 0
+
+
+def empty_cells(x, o):
+    """Empty cell indices in row-major order"""
+    occupied = x | o
+    return [cell for cell in range(CELLS) if not occupied & CELL_BITS[cell]]
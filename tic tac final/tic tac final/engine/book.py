@@ -0,0 +1,152 @@
+"""
+Opening book of every variant's first moves.
+
+The first AI move is the most expensive search of a game, and every game
+repeats it. The book holds the move each variant plays in every position
+X can face in the first PLIES plies, with either side moving first, keyed
+by the canonical form of the position (see engine.symmetry). A lookup
+transforms the position to its canonical form, reads the move and maps
+it back, so one entry serves all 8 rotations and reflections. Where
+several moves tie, the book move is the one the variant picks in the
+canonical orientation, which may be another of the tied moves than it
+would pick in the original one.
+
+Positions a variant's rules answer without searching (take the center,
+take a corner, ...) are left out, the rule is as fast as the book.
+
+Build the book once, offline, with:
+
+    python -m engine.book
+
+It is written as JSON next to this file. A Player created by
+engine.variants consults it before searching and counts its probes and
+hits in its OpeningBook.
+"""
+
+import os
+import sys
+
+from engine.bitboard import CELLS, FULL, POPCOUNT, WINNING
+from engine.symmetry import PERMUTATIONS, TRANSFORMS, canonical
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.json")
+
+# Plies from the start, counting the human's, the book covers
+PLIES = 3
+
+# Cell each cell is moved back to by the inverse of every transform
+INVERSES = tuple(tuple(permutation.index(cell) for cell in range(CELLS)) for permutation in PERMUTATIONS)
+
+
+def positions(plies=PLIES):
+    """Canonical (x, o) of every unfinished position with X to move within ``plies`` plies of the start"""
+    found = set()
+    frontier = {(0, 0, True), (0, 0, False)}
+    for _ in range(plies + 1):
+        following = set()
+        for x, o, x_to_move in frontier:
+            if WINNING[x] or WINNING[o] or x | o == FULL:
+                continue
+            if x_to_move:
+                found.add(canonical(x, o))
+            for cell in range(CELLS):
+                bit = 1 << cell
+                if not (x | o) & bit:
+                    following.add((x | bit, o, False) if x_to_move else (x, o | bit, True))
+        frontier = following
+    return sorted(found, key=lambda position: (POPCOUNT[position[0] | position[1]], position))
+
+
+class OpeningBook:
+    """One variant's book moves, with the probes and hits of the player using it"""
+
+    def __init__(self, moves, plies=PLIES):
+        self.moves = moves  # Canonical (x, o) -> cell, in the canonical orientation
+        self.plies = plies
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def move(self, x, o):
+        """X's book move in the position, or None if it is not in the book"""
+        self.probes += 1
+        if POPCOUNT[x | o] > self.plies:
+            return None
+        transform = min(range(len(TRANSFORMS)), key=lambda index: (TRANSFORMS[index][x], TRANSFORMS[index][o]))
+        cell = self.moves.get((TRANSFORMS[transform][x], TRANSFORMS[transform][o]))
+        if cell is None:
+            return None
+        self.hits += 1
+        return INVERSES[transform][cell]
+
+
+def generate(player, plies=PLIES):
+    """Canonical (x, o) -> cell of ``player``'s move in every book position its rules do not answer"""
+    moves = {}
+    for x, o in positions(plies):
+        if any(rule(x, o) is not None for rule in player.rules):
+            continue
+        cell, _ = player.move(x, o)
+        if cell is not None:
+            moves[(x, o)] = cell
+    return moves
+
+
+def build(path=DEFAULT_PATH, plies=PLIES):
+    """Generate every variant's book and write it; returns the number of entries"""
+    # The variants load the book, so they are imported only to build it
+    from engine.variants import MODERN_VARIANTS, VARIANTS, create, create_modern
+    import json
+
+    sections = {
+        "variants": {name: generate(create(name, book=False), plies) for name in VARIANTS},
+        "modern": {name: generate(create_modern(name, book=False), plies) for name in MODERN_VARIANTS},
+    }
+    data = {
+        "plies": plies,
+        **{section: {name: [[x, o, cell] for (x, o), cell in moves.items()] for name, moves in lines.items()}
+           for section, lines in sections.items()},
+    }
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+    return sum(len(moves) for lines in sections.values() for moves in lines.values())
+
+
+class Book:
+    def __init__(self, path=DEFAULT_PATH):
+        # json pulls in re, too slow to load with the engine when there is no book
+        import json
+        with open(path) as f:
+            data = json.load(f)
+        self.plies = data["plies"]
+        self.lines = {
+            (section, name): {(x, o): cell for x, o, cell in entries}
+            for section in ("variants", "modern")
+            for name, entries in data.get(section, {}).items()
+        }
+
+    def opening(self, section, name):
+        """A new OpeningBook of the variant, or None if the book has no line for it"""
+        moves = self.lines.get((section, name))
+        return OpeningBook(moves, self.plies) if moves is not None else None
+
+
+_loaded = {}
+
+
+def load(path=DEFAULT_PATH):
+    """Shared Book for ``path``, or None if the file has not been built yet"""
+    if path not in _loaded:
+        _loaded[path] = Book(path) if os.path.isfile(path) else None
+    return _loaded[path]
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    count = build(path)
+    print(f"Wrote {count} book moves for the first {PLIES} plies to {path}")
@@ -0,0 +1,76 @@
+"""
+Static evaluations used by the searches.
+
+threat_score and line_potential score the leaves of the depth-limited
+searches; center_control, corner_control and corner_defense are the
+variants' own evaluate functions, which also score finished games.
+All scores are from X's (the AI's) point of view.
+"""
+
+from engine.bitboard import CELL_BITS, FULL, POPCOUNT, WIN_MASKS, WINNING
+
+CENTER = CELL_BITS[4]
+CORNERS = CELL_BITS[0] | CELL_BITS[2] | CELL_BITS[6] | CELL_BITS[8]
+
+
+def threat_score(x, o):
+    """+5 for every line where X has two and the third cell is empty, -5 for O"""
+    score = 0
+    for line in WIN_MASKS:
+        x_count = POPCOUNT[x & line]
+        o_count = POPCOUNT[o & line]
+        if x_count == 2 and o_count == 0:
+            score += 5
+        if o_count == 2 and x_count == 0:
+            score -= 5
+    return score
+
+
+def line_potential(x, o):
+    """Pieces each side has on lines the opponent has not blocked yet"""
+    x_potential = 0
+    o_potential = 0
+    for line in WIN_MASKS:
+        if not o & line:
+            x_potential += POPCOUNT[x & line]
+        if not x & line:
+            o_potential += POPCOUNT[o & line]
+    return x_potential - o_potential
+
+
+def center_control(x, o):
+    """10 or -10 for a finished game, otherwise +1 if X holds the center, -1 if O does"""
+    if WINNING[x]:
+        return 10
+    if WINNING[o]:
+        return -10
+    if x & CENTER:
+        return 1
+    if o & CENTER:
+        return -1
+    return 0
+
+
+def corner_control(x, o, x_weight=1, o_weight=1):
+    """10 or -10 for a finished game, otherwise the weighted corner count of X minus O's"""
+    if WINNING[x]:
+        return 10
+    if WINNING[o]:
+        return -10
+    return x_weight * POPCOUNT[x & CORNERS] - o_weight * POPCOUNT[o & CORNERS]
+
+
+def corner_defense(x, o):
+    """corner_control weighting X's corners double, minus 5 for each cell where O would win"""
+    if WINNING[x]:
+        return 10
+    if WINNING[o]:
+        return -10
+    score = 2 * POPCOUNT[x & CORNERS] - POPCOUNT[o & CORNERS]
+    free = FULL ^ (x | o)
+    while free:
+        bit = free & -free
+        free ^= bit
+        if WINNING[o | bit]:
+            score -= 5
+    return score
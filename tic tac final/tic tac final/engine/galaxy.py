@@ -0,0 +1,79 @@
+"""
+The AI of the pygame "Galaxy Mode" game (``tic-tac-toe 2``), without pygame.
+
+That script opens its window and enters its event loop at import time,
+so its ``best_move`` is ported here on bitboards to play headless. The
+port keeps its rules exactly: a random cell on the empty board, and
+otherwise the first cell in row-major order with the best alpha-beta
+value four plies below the move. Wins score a flat 10 or -10 whatever
+their depth, so unlike Negamax it does not prefer the quickest win, and
+positions at the depth limit score 0.
+
+GalaxyPlayer has Player's ``move`` so it can stand in for a variant.
+"""
+
+import math
+import random
+
+from engine.bitboard import FULL, WINNING
+from engine.search import MOVES, SearchStats
+
+# Plies best_move searches below each of its moves
+DEPTH = 4
+
+
+class GalaxyPlayer:
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+        self.stats = None
+
+    def move(self, x, o, cancel=None):
+        """(cell, SearchStats) of X's move; ``cancel`` is accepted for Player's signature and ignored"""
+        free = FULL ^ (x | o)
+        if not free:
+            return None, SearchStats()
+        if free == FULL:
+            return self.rng.randrange(9), SearchStats()
+
+        self.stats = SearchStats()
+        best_score = -math.inf
+        best = None
+        for bit in MOVES[free]:
+            score = self._minimax(x | bit, o, DEPTH, -math.inf, math.inf, False, 1)
+            if score > best_score:
+                best_score = score
+                best = bit.bit_length() - 1
+        return best, self.stats
+
+    def _minimax(self, x, o, depth, alpha, beta, x_to_move, level):
+        stats = self.stats
+        stats.nodes += 1
+        stats.max_depth = max(stats.max_depth, level)
+        if WINNING[x]:
+            return 10
+        if WINNING[o]:
+            return -10
+        free = FULL ^ (x | o)
+        if not free or depth == 0:
+            stats.leaves += 1
+            return 0
+
+        if x_to_move:
+            best = -math.inf
+            for bit in MOVES[free]:
+                value = self._minimax(x | bit, o, depth - 1, alpha, beta, False, level + 1)
+                best = max(best, value)
+                alpha = max(alpha, value)
+                if beta <= alpha:
+                    stats.cutoffs += 1
+                    break
+        else:
+            best = math.inf
+            for bit in MOVES[free]:
+                value = self._minimax(x, o | bit, depth - 1, alpha, beta, True, level + 1)
+                best = min(best, value)
+                beta = min(beta, value)
+                if beta <= alpha:
+                    stats.cutoffs += 1
+                    break
+        return best
@@ -0,0 +1,308 @@
+"""
+Monte Carlo tree search (UCT) on a Board of any size.
+
+Minimax has to see every line to the end of the game or cut it off at a
+fixed depth with a guess; MCTS instead plays random games (playouts) from
+the position and spends them where the results so far look best. Each
+playout walks down the tree choosing the child with the best UCB1 score,
+
+    wins / visits + exploration * sqrt(ln(parent visits) / visits)
+
+expands the node it stops at, finishes the game from there with a
+rollout and counts the result in every node on the way back. The move
+played is the most visited root child.
+
+The tree lives in a NodeStore: one typed array per field, indexed by node
+number, with the children of a node in one contiguous run. Nodes are
+appended, never freed, and the store is cleared for the next search, so
+a search allocates no Python object per node.
+
+Rollouts are either
+- "random": uniformly random moves to the end of the game
+- "heuristic": a move that wins at once if there is one, else one that
+  blocks the opponent's win at once, else a random move; slower per
+  playout but far closer to real play
+
+MCTS has Negamax's ``search``, so a Player plays with it like with any
+other engine:
+
+    from engine.mcts import MCTS
+    from engine.nxn import Board
+    from engine.variants import Player
+    board = Board(7, 7, 5)
+    player = Player(MCTS(board, playouts=5000, time_limit=1000, rollout="heuristic"))
+    cell, stats = player.move(x, o)
+
+The search stops after ``playouts`` playouts or ``time_limit``
+milliseconds, whichever comes first. Its value is X's expected score of
+the move in [-1, 1]: 1 a sure win, -1 a sure loss.
+"""
+
+import math
+import random
+import time
+from array import array
+
+from engine.search import SearchCancelled, SearchResult, SearchStats
+
+ROLLOUTS = ("random", "heuristic")
+
+# The UCB1 constant: larger tries more of the less promising moves
+EXPLORATION = math.sqrt(2)
+
+# Status of a node after its first visit
+UNKNOWN, WON, DRAWN, OPEN = 0, 1, 2, 3
+
+NO_CHILDREN = -1
+
+
+class NodeStore:
+    """The search tree as parallel arrays; node 0 is the root"""
+
+    def __init__(self):
+        self.parent = array('i')
+        self.cell = array('i')  # Cell of the move into the node, -1 at the root
+        self.visits = array('i')
+        self.wins = array('d')  # Results for the side that moved into the node: 1 a win, 0.5 a draw
+        self.first_child = array('i')
+        self.child_count = array('i')
+        self.status = array('b')
+
+    def __len__(self):
+        return len(self.parent)
+
+    def clear(self):
+        for field in (self.parent, self.cell, self.visits, self.wins, self.first_child, self.child_count,
+                      self.status):
+            del field[:]
+
+    def add(self, parent, cell):
+        """Append a node and return its index"""
+        self.parent.append(parent)
+        self.cell.append(cell)
+        self.visits.append(0)
+        self.wins.append(0.0)
+        self.first_child.append(NO_CHILDREN)
+        self.child_count.append(0)
+        self.status.append(UNKNOWN)
+        return len(self.parent) - 1
+
+    def expand(self, node, cells):
+        """Give ``node`` one child per cell, in order"""
+        self.first_child[node] = len(self.parent)
+        self.child_count[node] = len(cells)
+        for cell in cells:
+            self.add(node, cell)
+
+    def children(self, node):
+        start = self.first_child[node]
+        return range(start, start + self.child_count[node]) if start != NO_CHILDREN else range(0)
+
+
+class MCTS:
+    # Playouts between two looks at the clock and the cancel event
+    CLOCK_INTERVAL = 16
+
+    def __init__(self, board, playouts=None, time_limit=None, rollout="random", exploration=EXPLORATION,
+                 rng=None):
+        if playouts is None and time_limit is None:
+            raise ValueError("MCTS needs a playout budget, a time_limit or both to stop at")
+        if rollout not in ROLLOUTS:
+            raise ValueError(f"Unknown rollout {rollout!r}, expected one of {', '.join(ROLLOUTS)}")
+        self.board = board
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.rollout = rollout
+        self.exploration = exploration
+        self.rng = rng or random.Random()
+        self.store = NodeStore()
+        self.stats = None
+        self._rollout = self._heuristic_rollout if rollout == "heuristic" else self._random_rollout
+        self._bits = tuple(1 << cell for cell in range(board.cells))
+
+    def search(self, x, o, x_to_move=True, depth=0, moves=None, cancel=None):
+        """
+        Most visited move for the side to move and its expected score for X.
+        ``moves`` restricts the root to a mask of cells; ``depth`` is
+        accepted for Negamax's signature and ignored.
+        """
+        board = self.board
+        self.stats = SearchStats()
+        self.stats.playouts = 0
+        free = board.full ^ (x | o)
+        if moves is not None:
+            free &= moves
+        if board.is_win(x) or board.is_win(o) or not free:
+            return SearchResult(None, None, self.stats)
+
+        self.new_root(free)
+        deadline = time.perf_counter() + self.time_limit / 1000 if self.time_limit is not None else None
+        self.stats.playouts = self.grow(x, o, 0 if x_to_move else 1, self.playouts, deadline, cancel)
+        self.stats.nodes = len(self.store)
+        return self.best(self.root_children(), x_to_move, self.stats)
+
+    def new_root(self, free):
+        """Clear the tree down to a root with one child per cell of ``free``"""
+        store = self.store
+        store.clear()
+        root = store.add(-1, -1)
+        store.status[root] = OPEN
+        store.expand(root, [cell for cell in range(self.board.cells) if free >> cell & 1])
+
+    def grow(self, x, o, side, budget, deadline, cancel=None):
+        """
+        Run playouts from the root until ``budget`` playouts (if not None)
+        or the ``deadline`` (a perf_counter time, if not None); returns the
+        number run.
+        """
+        played = 0
+        while budget is None or played < budget:
+            self._playout(x, o, side)
+            played += 1
+            if not played % self.CLOCK_INTERVAL:
+                if cancel is not None and cancel.is_set():
+                    raise SearchCancelled
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+        return played
+
+    def root_children(self):
+        """(cell, visits, wins) of every root move"""
+        store = self.store
+        return [(store.cell[child], store.visits[child], store.wins[child]) for child in store.children(0)]
+
+    @staticmethod
+    def best(children, x_to_move, stats):
+        """SearchResult of the most visited of (cell, visits, wins) root moves, the first of equals"""
+        cell, visits, wins = max(children, key=lambda child: child[1])
+        score = 2 * wins / visits - 1 if visits else 0.0
+        return SearchResult(score if x_to_move else -score, cell, stats)
+
+    def _playout(self, x, o, side):
+        """Select, expand, roll out and back the result up, from the root with ``side`` to move"""
+        path, pieces, mover, state = self._select(x, o, side)
+        self._backup(path, side, self._finish(pieces, mover, state))
+
+    def _select(self, x, o, side):
+        """
+        Walk down to a node the tree cannot answer for yet, expanding on the
+        way; returns the path of nodes, the pieces and the side that moved
+        into the last node, and its status.
+        """
+        store = self.store
+        visits = store.visits
+        wins = store.wins
+        first_child = store.first_child
+        child_count = store.child_count
+        status = store.status
+        board = self.board
+        bits = self._bits
+        exploration = self.exploration
+
+        pieces = [x, o]
+        path = [0]
+        node = 0
+        mover = side
+        while True:
+            # Descend to the child with the best UCB1 score, an unvisited one first
+            start = first_child[node]
+            log_visits = math.log(visits[node]) if visits[node] else 0.0
+            best = -1.0
+            child = start
+            for index in range(start, start + child_count[node]):
+                count = visits[index]
+                if not count:
+                    child = index
+                    break
+                score = wins[index] / count + exploration * math.sqrt(log_visits / count)
+                if score > best:
+                    best = score
+                    child = index
+            mover = side if len(path) % 2 else 1 - side
+            bit = bits[store.cell[child]]
+            pieces[mover] |= bit
+            node = child
+            path.append(node)
+
+            state = status[node]
+            if state == UNKNOWN:
+                if board.wins_with(pieces[mover], bit):
+                    state = WON
+                elif pieces[0] | pieces[1] == board.full:
+                    state = DRAWN
+                else:
+                    state = OPEN
+                status[node] = state
+                if state == OPEN:
+                    # A new leaf, to finish with a rollout
+                    break
+            if state == OPEN and first_child[node] == NO_CHILDREN:
+                free = board.full ^ (pieces[0] | pieces[1])
+                store.expand(node, [cell for cell in range(board.cells) if free >> cell & 1])
+                # A store with no room left marks the node instead, see engine.parallel_mcts
+                state = status[node]
+            if state != OPEN:
+                break
+
+        stats = self.stats
+        if len(path) - 1 > stats.max_depth:
+            stats.max_depth = len(path) - 1
+        return path, pieces, mover, state
+
+    def _finish(self, pieces, mover, state):
+        """Winner (0 for X, 1 for O) of the game below the selected node, or -1 for a draw"""
+        if state == WON:
+            return mover
+        if state == DRAWN:
+            return -1
+        return self._rollout(pieces, 1 - mover)
+
+    def _backup(self, path, side, winner):
+        visits = self.store.visits
+        wins = self.store.wins
+        # Node i of the path was moved into by the side to move at the root when i is odd
+        for depth, index in enumerate(path):
+            visits[index] += 1
+            if winner < 0:
+                wins[index] += 0.5
+            elif (winner == side) == (depth % 2 == 1):
+                wins[index] += 1.0
+
+    def _random_rollout(self, pieces, side):
+        """Winner (0 for X, 1 for O) of random moves from the position, or -1 for a draw"""
+        board = self.board
+        bits = self._bits
+        occupied = pieces[0] | pieces[1]
+        cells = [cell for cell in range(board.cells) if not occupied >> cell & 1]
+        self.rng.shuffle(cells)
+        own = [pieces[0], pieces[1]]
+        for cell in cells:
+            bit = bits[cell]
+            own[side] |= bit
+            if board.wins_with(own[side], bit):
+                return side
+            side = 1 - side
+        return -1
+
+    def _heuristic_rollout(self, pieces, side):
+        """Winner of a rollout that wins or blocks a win at once when it can, or -1 for a draw"""
+        board = self.board
+        bits = self._bits
+        wins_with = board.wins_with
+        occupied = pieces[0] | pieces[1]
+        cells = [cell for cell in range(board.cells) if not occupied >> cell & 1]
+        self.rng.shuffle(cells)
+        own = [pieces[0], pieces[1]]
+        while cells:
+            mine, theirs = own[side], own[1 - side]
+            choice = None
+            for index, cell in enumerate(cells):
+                if wins_with(mine | bits[cell], bits[cell]):
+                    return side
+                if choice is None and wins_with(theirs | bits[cell], bits[cell]):
+                    choice = index
+            # The random order makes the last cell a random move
+            cell = cells.pop(choice if choice is not None else -1)
+            own[side] |= bits[cell]
+            side = 1 - side
+        return -1
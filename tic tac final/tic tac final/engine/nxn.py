@@ -0,0 +1,485 @@
+"""
+Rows x columns boards won by k in a row.
+
+A Board generates its win lines when it is created: every run of k cells
+along a row, a column or either diagonal, each as a bitmask over the
+``rows * cols`` cells (bit ``row * cols + col``, as on the 3x3 bitboard).
+Every cell also gets the lines through it, so whether a move won is
+decided from that move alone, in O(k) on any board size, instead of
+rescanning every line. Its evaluations are the 3x3 ones generalized to
+any board, and BoardNegamax is Negamax searching on it, so every
+strategy runs on any board size:
+
+    from engine.nxn import Board, create
+    board = Board(4, 4, 3)
+    player = create("alpha_beta", board)
+    cell, stats = player.move(x, o)
+
+The "mcts" strategy plays by Monte Carlo tree search (engine.mcts)
+within the heuristic strategy's time limit instead of searching a
+fixed number of plies, for boards too large for either. The "proof"
+strategy plays the move of a proven win or draw (engine.proof) and
+falls back to the heuristic strategy when PROOF_NODES nodes do not
+settle the position.
+
+The heuristic and mcts strategies try a threat-space search
+(engine.threats) before searching: a forced win by threats is played
+at once, and the search only runs when none is found.
+
+LineCounts keeps the per-line counts the line heuristics are built on up
+to date as the search makes and unmakes moves, so the heuristic strategy
+reads its evaluation at a leaf in O(1).
+
+Wins score ``board.win_score - depth``, which is 10 on 3x3 as in the
+other variants and more than the number of cells on larger boards, so a
+win is always worth more than any evaluation. Board(3, 3, 3) plays the
+same moves as the 3x3 engine; that engine stays the fast path, with its
+512-entry tables, symmetry reduction and tablebase.
+"""
+
+import math
+
+from engine.mcts import MCTS
+from engine.ordering import MoveOrdering
+from engine.proof import ProofSolver
+from engine.search import Negamax, SearchResult
+from engine.transposition import TranspositionTable
+from engine.variants import HEURISTIC_TIME_LIMIT_MS, Player
+
+# Nodes the proof strategy may spend on each proof before it falls back to the heuristic search
+PROOF_NODES = 20_000
+
+
+def popcount(mask):
+    return bin(mask).count('1')
+
+
+def bits(mask):
+    """Bits of ``mask`` from the lowest, i.e. cells in row-major order"""
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
+
+
+class Board:
+    # (row step, column step) of the rows, columns, diagonals and anti-diagonals
+    DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+    def __init__(self, rows=3, cols=3, k=3):
+        if rows < 1 or cols < 1:
+            raise ValueError(f"A board needs at least one row and one column, got {rows}x{cols}")
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError(f"Win length {k} does not fit on a {rows}x{cols} board")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.cells = rows * cols
+        self.full = (1 << self.cells) - 1
+        self.win_score = max(10, self.cells + 1)
+        self.lines = self._lines()
+        # Win lines through each cell, by cell bit: at most k per direction
+        self.lines_through = {
+            1 << cell: tuple(line for line in self.lines if line >> cell & 1) for cell in range(self.cells)
+        }
+
+        middle_rows = {(rows - 1) // 2, rows // 2}
+        middle_cols = {(cols - 1) // 2, cols // 2}
+        self.center_cells = tuple(self.cell_index(r, c) for r in sorted(middle_rows) for c in sorted(middle_cols))
+        self.corner_cells = tuple(sorted({0, cols - 1, (rows - 1) * cols, self.cells - 1}))
+        self.center = sum(1 << cell for cell in self.center_cells)
+        self.corners = sum(1 << cell for cell in self.corner_cells)
+
+        # Cells on the most lines first, row-major among equals: center, corners, edges on 3x3
+        self.static_order = tuple(sorted(range(self.cells), key=lambda cell: -len(self.lines_through[1 << cell])))
+
+    def _lines(self):
+        lines = []
+        for dr, dc in self.DIRECTIONS:
+            for row in range(self.rows):
+                for col in range(self.cols):
+                    end_row = row + dr * (self.k - 1)
+                    end_col = col + dc * (self.k - 1)
+                    if 0 <= end_row < self.rows and 0 <= end_col < self.cols:
+                        lines.append(sum(1 << self.cell_index(row + dr * i, col + dc * i) for i in range(self.k)))
+        # A 1-cell line runs in every direction; keep each line once
+        return tuple(dict.fromkeys(lines))
+
+    def __repr__(self):
+        return f"Board({self.rows}, {self.cols}, {self.k})"
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and (self.rows, self.cols, self.k) == (other.rows, other.cols, other.k)
+
+    def __hash__(self):
+        return hash((self.rows, self.cols, self.k))
+
+    def __reduce__(self):
+        return Board, (self.rows, self.cols, self.k)
+
+    def cell_index(self, row, col):
+        return row * self.cols + col
+
+    def cell_position(self, cell):
+        return divmod(cell, self.cols)
+
+    def from_board(self, board):
+        """Convert a list board ('X', 'O', '-' or '') of this size to (x, o) bitboards"""
+        x = o = 0
+        for i, row in enumerate(board):
+            for j, value in enumerate(row):
+                if value == 'X':
+                    x |= 1 << self.cell_index(i, j)
+                elif value == 'O':
+                    o |= 1 << self.cell_index(i, j)
+        return x, o
+
+    def empty_cells(self, x, o):
+        """Empty cell indices in row-major order"""
+        occupied = x | o
+        return [cell for cell in range(self.cells) if not occupied >> cell & 1]
+
+    def is_win(self, mask):
+        """True if the side owning ``mask`` has k in a row"""
+        for line in self.lines:
+            if mask & line == line:
+                return True
+        return False
+
+    def wins_with(self, mask, bit):
+        """
+        True if the move at ``bit`` completes k in a row for the side owning
+        ``mask`` (which includes it). The searches' terminal test: only the
+        lines through the last move can have been completed by it.
+        """
+        for line in self.lines_through[bit]:
+            if mask & line == line:
+                return True
+        return False
+
+    def evaluate(self, x, o):
+        """win_score if X has won, -win_score if O has won, 0 otherwise"""
+        if self.is_win(x):
+            return self.win_score
+        if self.is_win(o):
+            return -self.win_score
+        return 0
+
+    # Evaluations, from X's point of view as in engine.evaluation
+
+    def threat_score(self, x, o):
+        """+5 for every line where X lacks one piece and O has none, -5 for O"""
+        score = 0
+        threat = self.k - 1
+        for line in self.lines:
+            x_count = popcount(x & line)
+            o_count = popcount(o & line)
+            if x_count == threat and o_count == 0:
+                score += 5
+            if o_count == threat and x_count == 0:
+                score -= 5
+        return score
+
+    def line_potential(self, x, o):
+        """Pieces each side has on lines the opponent has not blocked yet"""
+        x_potential = 0
+        o_potential = 0
+        for line in self.lines:
+            if not o & line:
+                x_potential += popcount(x & line)
+            if not x & line:
+                o_potential += popcount(o & line)
+        return x_potential - o_potential
+
+    def center_control(self, x, o):
+        """win_score or -win_score for a finished game, otherwise center cells of X minus O's"""
+        result = self.evaluate(x, o)
+        if result:
+            return result
+        return popcount(x & self.center) - popcount(o & self.center)
+
+    def corner_control(self, x, o, x_weight=1, o_weight=1):
+        """win_score or -win_score for a finished game, otherwise the weighted corner count of X minus O's"""
+        result = self.evaluate(x, o)
+        if result:
+            return result
+        return x_weight * popcount(x & self.corners) - o_weight * popcount(o & self.corners)
+
+    # Rules and root-move filters of engine.variants.Player
+
+    def take_center(self, x, o):
+        """The first free center cell"""
+        for cell in self.center_cells:
+            if not (x | o) >> cell & 1:
+                return cell
+        return None
+
+    def corners_while_free(self, x, o):
+        """Root moves limited to the corners while one is free"""
+        return self.corners if self.corners & ~(x | o) else None
+
+
+class LineCounts:
+    """
+    X and O counts of every win line of a position, with the totals the
+    line heuristics read, updated as moves are made and unmade.
+
+    A line's state is ``x_count * (k + 1) + o_count``, and the change a
+    move makes to each total is looked up from the state the line was in,
+    so make and unmake only touch the lines through the cell:
+    O(lines through cell) per move instead of O(lines) per evaluation.
+
+    threat_score and line_potential match the Board evaluations of the
+    position the counts were last moved to; their (x, o) arguments are
+    only there to fit the evaluation signature.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        index = {line: i for i, line in enumerate(board.lines)}
+        self.lines_through = {bit: tuple(index[line] for line in lines) for bit, lines in board.lines_through.items()}
+
+        k = board.k
+        states = range((k + 1) * (k + 1))
+        threats = [0] * len(states)
+        potential = [0] * len(states)
+        for state in states:
+            x_count, o_count = divmod(state, k + 1)
+            if x_count + o_count > k:
+                continue
+            if o_count == 0:
+                threats[state] += x_count == k - 1
+                potential[state] += x_count
+            if x_count == 0:
+                threats[state] -= o_count == k - 1
+                potential[state] -= o_count
+        # Per side: the state step of a move and the change it makes to each total
+        self.steps = (k + 1, 1)
+        self.threat_deltas = tuple(
+            tuple(threats[state + step] - threats[state] if state + step < len(states) else 0 for state in states)
+            for step in self.steps)
+        self.potential_deltas = tuple(
+            tuple(potential[state + step] - potential[state] if state + step < len(states) else 0 for state in states)
+            for step in self.steps)
+        self.reset()
+
+    def __reduce__(self):
+        # Rebuilt rather than unpickled field by field: a process pool's worker then gets a LineCounts
+        # as fast as one built there. The counts are reset by every search anyway.
+        return LineCounts, (self.board,)
+
+    def reset(self, x=0, o=0):
+        """Recount every line for the position (x, o)"""
+        self.states = [0] * len(self.board.lines)
+        self.threats = 0  # X lines one piece short with no O on them, minus O's
+        self.potential = 0  # line_potential
+        for side, mask in enumerate((x, o)):
+            for bit in bits(mask):
+                self.make(bit, side)
+
+    def make(self, bit, side):
+        """Count a piece of ``side`` (0 for X, 1 for O) at ``bit``"""
+        states = self.states
+        step = self.steps[side]
+        threat_deltas = self.threat_deltas[side]
+        potential_deltas = self.potential_deltas[side]
+        for line in self.lines_through[bit]:
+            state = states[line]
+            self.threats += threat_deltas[state]
+            self.potential += potential_deltas[state]
+            states[line] = state + step
+
+    def unmake(self, bit, side):
+        """Take back the piece make() counted"""
+        states = self.states
+        step = self.steps[side]
+        threat_deltas = self.threat_deltas[side]
+        potential_deltas = self.potential_deltas[side]
+        for line in self.lines_through[bit]:
+            state = states[line] - step
+            self.threats -= threat_deltas[state]
+            self.potential -= potential_deltas[state]
+            states[line] = state
+
+    def threat_score(self, x, o):
+        return 5 * self.threats
+
+    def line_potential(self, x, o):
+        return self.potential
+
+
+class BoardNegamax(Negamax):
+    """
+    Negamax on a Board. Takes Negamax's options except symmetry and
+    tablebase, which only exist for 3x3; the transposition table is keyed
+    on the position itself, packed into one integer. With ``line_counts``
+    (a LineCounts of the board) every move is made and unmade on it, so
+    its evaluations can be the engine's.
+    """
+
+    def __init__(self, board, evaluation=None, max_depth=None, line_counts=None, **options):
+        if options.get("symmetry") or options.get("tablebase") is not None:
+            raise ValueError("Symmetry reduction and the tablebase are only available on the 3x3 engine")
+        super().__init__(evaluation, max_depth, **options)
+        self.board = board
+        self.line_counts = line_counts
+
+    def _free_count(self, x, o):
+        return popcount(self.board.full ^ (x | o))
+
+    def _root_key(self, x, o, x_to_move):
+        return None
+
+    def _search_root(self, x, o, x_to_move, depth, moves):
+        board = self.board
+        color = 1 if x_to_move else -1
+        own, other = (x, o) if x_to_move else (o, x)
+        free = board.full ^ (x | o)
+        if moves is not None:
+            free &= moves
+        if board.is_win(x) or board.is_win(o) or not free:
+            return SearchResult(None, None, self.stats)
+        counts = self.line_counts
+        if counts is not None:
+            counts.reset(x, o)
+        side = 0 if x_to_move else 1
+
+        alpha = -math.inf
+        beta = math.inf
+        best = -math.inf
+        best_move = None
+        for bit in bits(free):
+            child = own | bit
+            if board.wins_with(child, bit):
+                if self.exact:
+                    return SearchResult(color * (board.win_score - depth), bit.bit_length() - 1, self.stats)
+                val = board.win_score - depth
+            elif counts is not None:
+                counts.make(bit, side)
+                val = -self._search(other, child, depth, -beta, -alpha, -color, None)
+                counts.unmake(bit, side)
+            else:
+                val = -self._search(other, child, depth, -beta, -alpha, -color, None)
+            if self.root_bonus is not None:
+                cx, co = (child, other) if x_to_move else (other, child)
+                val += color * self.root_bonus(cx, co)
+            if val > best:
+                best = val
+                best_move = bit.bit_length() - 1
+                if self.alphabeta and self.root_bonus is None and val > alpha:
+                    alpha = val
+        return SearchResult(color * best, best_move, self.stats)
+
+    def _search(self, own, other, depth, alpha, beta, color, key):
+        """
+        Value of the position for the side to move (``own``); ``other`` has
+        just moved, without winning: wins are scored by the parent, from the
+        move that made them.
+        """
+        board = self.board
+        free = board.full ^ (own | other)
+        if not free:
+            return 0
+        if self._limit is not None and depth >= self._limit:
+            return color * (self._evaluate(own, other) if color > 0 else self._evaluate(other, own))
+
+        table = self.table
+        if table is not None:
+            # The value for the side to move depends only on whose pieces are whose
+            probe = own << board.cells | other
+            value = table.lookup(probe, depth, alpha, beta)
+            if value is not None:
+                return value
+
+        ordering = self.ordering
+        on_cutoff = self._on_cutoff
+        side = 0 if color > 0 else 1
+        moves = bits(free) if ordering is None else ordering.order(free, depth, side)
+        alpha_orig = alpha
+        exact = self.exact
+        counts = self.line_counts
+        best = -math.inf
+        wins_with = board.wins_with
+        for index, bit in enumerate(moves):
+            child = own | bit
+            if wins_with(child, bit):
+                val = board.win_score - 1 - depth
+                if exact:
+                    best = val
+                    break
+            elif counts is not None:
+                counts.make(bit, side)
+                val = -self._search(other, child, depth + 1, -beta, -alpha, -color, None)
+                counts.unmake(bit, side)
+            else:
+                val = -self._search(other, child, depth + 1, -beta, -alpha, -color, None)
+            if val > best:
+                best = val
+                if self.alphabeta and val > alpha:
+                    alpha = val
+                    if alpha >= beta:
+                        if on_cutoff is not None:
+                            on_cutoff(bit, index, depth, side, popcount(free))
+                        break
+
+        if table is not None:
+            table.store(probe, depth, best, alpha_orig, beta)
+        return best
+
+
+def threat_rules(board, threats):
+    """The threat-space search as a Player's rules, if ``threats``"""
+    if not threats:
+        return ()
+    # engine.threats is built on this module's helpers
+    from engine.threats import ThreatSearch
+    return (ThreatSearch(board),)
+
+
+def heuristic(board, threats=True, **options):
+    """
+    Iterative deepening scored by the threat heuristic, read from line
+    counts kept by the search, until the time limit unless options set one
+    """
+    counts = LineCounts(board)
+    options.setdefault("time_limit", HEURISTIC_TIME_LIMIT_MS)
+    return Player(BoardNegamax(board, counts.threat_score, alphabeta=False, line_counts=counts, **options),
+                  rules=threat_rules(board, threats))
+
+
+def mcts(board, threats=True, **options):
+    """UCT playouts until the heuristic strategy's time limit, unless options set one"""
+    options.setdefault("time_limit", HEURISTIC_TIME_LIMIT_MS)
+    return Player(MCTS(board, **options), rules=threat_rules(board, threats))
+
+
+STRATEGIES = {
+    # One move ahead, scored by the center control heuristic
+    "center": lambda board, **options: Player(
+        BoardNegamax(board, board.center_control, max_depth=0, alphabeta=False, **options),
+        rules=(board.take_center,)),
+    # One move ahead, scored by the corner control heuristic
+    "corner": lambda board, **options: Player(
+        BoardNegamax(board, board.corner_control, max_depth=0, alphabeta=False, **options),
+        root_moves=board.corners_while_free),
+    "minimax": lambda board, **options: Player(BoardNegamax(board, alphabeta=False, **options)),
+    "alpha_beta": lambda board, **options: Player(
+        BoardNegamax(board, table=TranspositionTable(), ordering=MoveOrdering(board=board), **options)),
+    "heuristic": heuristic,
+    # UCT playouts until the time limit, with random rollouts: the most playouts per move
+    "mcts": mcts,
+    # Proven wins and draws, the heuristic search for the rest
+    "proof": lambda board, **options: Player(
+        ProofSolver(board, max_nodes=PROOF_NODES, fallback=heuristic(board, **options).engine)),
+}
+
+
+def create(strategy, board, **options):
+    """
+    Player of one of the strategies on ``board``; options are passed on to
+    BoardNegamax, or MCTS. The heuristic and mcts strategies also take
+    ``threats=False`` to search every move without the threat-space search.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}, expected one of {', '.join(STRATEGIES)}")
+    return STRATEGIES[strategy](board, **options)
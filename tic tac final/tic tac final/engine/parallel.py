@@ -0,0 +1,243 @@
+"""
+Root-split parallel search.
+
+The subtrees below the root moves are independent, so a root-split
+engine hands each root move to a ProcessPoolExecutor. Every worker
+process builds its own copy of the engine from its options (its own
+transposition table and move ordering, kept between moves) and searches
+one child per task. The workers share the best root value found so far
+through a multiprocessing.Value: a task narrows its window with it when
+it starts and raises it when it finds something better, so later root
+moves are pruned against earlier results as in the sequential loop.
+
+A child searched against a raised bound may fail low with a value equal
+to the bound, which hides a tie with the move that set it. Those earlier
+ties are searched again with a window just below the best value, so the
+chosen move is the same first-best in row-major order as the sequential
+engine's.
+
+There are two engines, built on the same RootSplit:
+
+- ParallelNegamax, Negamax on the 3x3 bitboard, with its symmetry
+  reduction and tablebase
+- ParallelBoardNegamax, BoardNegamax on a Board of any size, the one
+  worth a pool: a root subtree of a large board takes long enough to
+  pay for sending it to another process, a 3x3 one does not
+
+The pool is an engine.pool.WorkerPool on the spawn start method, so the
+evaluation and root bonus must be picklable
+(module-level functions, partials of them, or methods of a picklable
+object such as LineCounts). Searches answered by the tablebase never
+reach the pool.
+"""
+
+import math
+import os
+import time
+
+from engine.bitboard import FULL, POPCOUNT, WINNING
+from engine.nxn import BoardNegamax, bits
+from engine.pool import CONTEXT, WorkerPool
+from engine.search import MOVES, Negamax, SearchResult, SearchStats
+from engine.transposition import TranspositionTable
+
+_engine = None
+_shared_alpha = None
+_abort = None
+
+
+def _init_worker(engine_class, args, options, table, shared_alpha, abort):
+    global _engine, _shared_alpha, _abort
+    _engine = engine_class(*args, table=TranspositionTable() if table else None, **options)
+    _shared_alpha = shared_alpha
+    _abort = abort
+
+
+def _search_child(own, other, bit, key, depth, color, limit, deadline, share_alpha):
+    """
+    Value of root move ``bit`` for the side to move, the lower window bound
+    it was searched with and the task's SearchStats. ``deadline`` is wall
+    clock time, the one clock the processes share.
+    """
+    engine = _engine
+    engine.stats = SearchStats() if engine.collect_stats else None
+    engine._limit = limit
+    engine._root_depth = depth
+    engine._deadline = time.perf_counter() + deadline - time.time() if deadline is not None else None
+    engine._cancel = _abort
+    if engine.table is not None:
+        engine.table.reset_counters()
+
+    alpha = _shared_alpha.value if share_alpha else -math.inf
+    value = engine._child_value(own, other, bit, depth, alpha, color, key)
+    if share_alpha and value > alpha:
+        with _shared_alpha.get_lock():
+            if value > _shared_alpha.value:
+                _shared_alpha.value = value
+
+    if engine.stats is not None and engine.table is not None:
+        engine.stats.cache_hits += engine.table.hits
+    return value, alpha, engine.stats
+
+
+class RootSplit:
+    """
+    The pool side of a root-split engine, mixed in ahead of the engine
+    class. The engine lists the root moves in ``_search_root``, hands them
+    to ``_split`` and supplies ``_child_value``, the search of one of them;
+    every worker builds the same class from ``args`` and the options.
+    """
+
+    def _setup(self, workers, args, evaluation, max_depth, options):
+        self.workers = workers or os.cpu_count() or 1
+        # What every worker needs to rebuild the engine; the tablebase is only read at the root
+        self._worker_args = args
+        self._worker_options = dict(options, evaluation=evaluation, max_depth=max_depth)
+        self._worker_options.pop("table", None)
+        self._worker_options.pop("tablebase", None)
+        self._pool = None
+        self._shared_alpha = None
+
+    def _start_pool(self):
+        self._shared_alpha = CONTEXT.Value("d", -math.inf)
+        self._pool = WorkerPool(
+            self.workers, _init_worker,
+            (type(self), self._worker_args, self._worker_options, self.table is not None, self._shared_alpha))
+
+    def close(self):
+        """Shut the worker processes down; the next search starts new ones"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _split(self, own, other, x_to_move, depth, children):
+        """SearchResult of the root moves ``children``, (bit, key) pairs, searched on the pool"""
+        color = 1 if x_to_move else -1
+        # Root bonuses change the values after the search, so they need every child's exact value
+        share_alpha = self.alphabeta and self.root_bonus is None
+        results = self._run(own, other, children, depth, color, share_alpha)
+
+        values = []
+        for (bit, child_key), (value, alpha, stats) in zip(children, results):
+            if self.root_bonus is not None:
+                cx, co = (own | bit, other) if x_to_move else (other, own | bit)
+                value += color * self.root_bonus(cx, co)
+            values.append((value, alpha))
+        best = max(value for value, alpha in values if value > alpha)
+
+        best_move = None
+        for (bit, child_key), (value, alpha) in zip(children, values):
+            if value > alpha:
+                if value == best:
+                    best_move = bit
+                    break
+            elif alpha >= best and self._ties_best(own, other, bit, child_key, depth, color, best):
+                best_move = bit
+                break
+        return SearchResult(color * best, best_move.bit_length() - 1, self.stats)
+
+    def _run(self, own, other, children, depth, color, share_alpha):
+        """Search every root child in the pool; their results in the same order"""
+        if self._pool is None:
+            self._start_pool()
+        self._shared_alpha.value = -math.inf
+        deadline = time.time() + self._deadline - time.perf_counter() if self._deadline is not None else None
+        # A worker's SearchTimeout is raised again here
+        results = self._pool.run(
+            _search_child,
+            [(own, other, bit, child_key, depth, color, self._limit, deadline, share_alpha)
+             for bit, child_key in children],
+            self._cancel)
+        if self.stats is not None:
+            for value, alpha, stats in results:
+                self.stats.nodes += stats.nodes
+                self.stats.leaves += stats.leaves
+                self.stats.cutoffs += stats.cutoffs
+                self.stats.cache_hits += stats.cache_hits
+                self.stats.max_depth = max(self.stats.max_depth, stats.max_depth)
+        return results
+
+    def _ties_best(self, own, other, bit, child_key, depth, color, best):
+        """Whether a root move that failed low against ``best`` actually reaches it"""
+        return self._child_value(own, other, bit, depth, math.nextafter(best, -math.inf), color, child_key) >= best
+
+
+class ParallelNegamax(RootSplit, Negamax):
+    def __init__(self, evaluation=None, max_depth=None, workers=None, **options):
+        super().__init__(evaluation, max_depth, **options)
+        self._setup(workers, (), evaluation, max_depth, options)
+
+    def _search_root(self, x, o, x_to_move, depth, moves):
+        if self.tablebase is not None and self.exact:
+            return super()._search_root(x, o, x_to_move, depth, moves)
+
+        color = 1 if x_to_move else -1
+        own, other = (x, o) if x_to_move else (o, x)
+        free = FULL ^ (x | o)
+        if moves is not None:
+            free &= moves
+        if WINNING[x] or WINNING[o] or not free:
+            return SearchResult(None, None, self.stats)
+
+        key = self._root_key(x, o, x_to_move)
+        symmetric = key.__class__ is tuple
+        leaving = symmetric and POPCOUNT[x | o] >= self.SYMMETRY_PIECES
+        children = []
+        seen = set()
+        for bit in MOVES[free]:
+            child_key = self._child_key(key, color, bit)
+            if symmetric:
+                form = min(child_key)
+                if form in seen:
+                    continue
+                seen.add(form)
+                if leaving:
+                    child_key = self._plain_key(child_key)
+            if self.exact and WINNING[own | bit]:
+                return SearchResult(color * (10 - depth), bit.bit_length() - 1, self.stats)
+            children.append((bit, child_key))
+        return self._split(own, other, x_to_move, depth, children)
+
+    def _child_value(self, own, other, bit, depth, alpha, color, key):
+        return -self._search(other, own | bit, depth, -math.inf, -alpha, -color, key)
+
+
+class ParallelBoardNegamax(RootSplit, BoardNegamax):
+    def __init__(self, board, evaluation=None, max_depth=None, workers=None, **options):
+        super().__init__(board, evaluation, max_depth, **options)
+        # line_counts goes to the workers with the evaluation, so a LineCounts method stays bound to it
+        self._setup(workers, (board,), evaluation, max_depth, options)
+
+    def _search_root(self, x, o, x_to_move, depth, moves):
+        board = self.board
+        color = 1 if x_to_move else -1
+        own, other = (x, o) if x_to_move else (o, x)
+        free = board.full ^ (x | o)
+        if moves is not None:
+            free &= moves
+        if board.is_win(x) or board.is_win(o) or not free:
+            return SearchResult(None, None, self.stats)
+        if self.exact:
+            for bit in bits(free):
+                if board.wins_with(own | bit, bit):
+                    return SearchResult(color * (board.win_score - depth), bit.bit_length() - 1, self.stats)
+        return self._split(own, other, x_to_move, depth, [(bit, None) for bit in bits(free)])
+
+    def _child_value(self, own, other, bit, depth, alpha, color, key):
+        board = self.board
+        child = own | bit
+        if board.wins_with(child, bit):
+            return board.win_score - depth
+        counts = self.line_counts
+        if counts is None:
+            return -self._search(other, child, depth, -math.inf, -alpha, -color, None)
+        side = 0 if color > 0 else 1
+        counts.reset(*((own, other) if side == 0 else (other, own)))
+        counts.make(bit, side)
+        return -self._search(other, child, depth, -math.inf, -alpha, -color, None)
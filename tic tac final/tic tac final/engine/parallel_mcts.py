@@ -0,0 +1,241 @@
+"""
+Monte Carlo tree search on several processes.
+
+A single process runs a few thousand playouts per second on a large
+board. ParallelMCTS spends more cores on the same move in one of two ways:
+
+- root parallel (``mode="root"``): every worker grows its own tree from
+  the position with its own random rollouts, and the root visits and
+  wins of all the trees are summed; the move played is the most visited
+  over all of them. The trees share nothing while they grow.
+- tree parallel (``mode="tree"``): the workers grow one tree, a
+  SharedNodeStore in shared memory. A worker holds a lock while it
+  selects a path and expands it and while it backs a result up; the
+  rollouts, the bulk of a playout, run in parallel. On the way down it
+  adds a virtual loss to every node of its path, visits without wins, so
+  the other workers see those nodes as worse and spread over other lines
+  instead of all following the same one. The backup takes it off again.
+
+The shared tree has a fixed capacity, allocated when the pool starts;
+once it is full, a leaf that would be expanded is marked FULL instead,
+and playouts go on from it by rollout without descending any further.
+
+The playout budget is split evenly between the workers, while a time
+limit applies to each of them. As in engine.parallel the pool is an
+engine.pool.WorkerPool kept between moves, each worker keeping its own
+MCTS, and ``cancel`` stops every worker.
+"""
+
+import os
+import random
+import time
+
+from engine.mcts import EXPLORATION, MCTS, NO_CHILDREN, ROLLOUTS, UNKNOWN
+from engine.pool import CONTEXT, WorkerPool
+from engine.search import SearchResult, SearchStats
+
+MODES = ("root", "tree")
+
+# Nodes the shared tree can hold, about 30 bytes each
+CAPACITY = 1 << 20
+
+# Status of an open node the full shared tree had no room to expand, after engine.mcts's
+# UNKNOWN, WON, DRAWN and OPEN; MCTS rolls out from it
+FULL = 4
+
+# Visits added to every node on a path while its playout is running
+VIRTUAL_LOSS = 1
+
+
+class SharedNodeStore:
+    """NodeStore's arrays in shared memory, with a fixed capacity"""
+
+    FIELDS = (("parent", "i"), ("cell", "i"), ("visits", "i"), ("wins", "d"), ("first_child", "i"),
+              ("child_count", "i"), ("status", "b"))
+
+    def __init__(self, capacity, context):
+        self.capacity = capacity
+        for name, code in self.FIELDS:
+            setattr(self, name, context.RawArray(code, capacity))
+        self.size = context.RawValue("i", 0)
+
+    def __len__(self):
+        return self.size.value
+
+    def clear(self):
+        self.size.value = 0
+
+    def add(self, parent, cell):
+        """Write a node at the end and return its index, or -1 if the store is full"""
+        index = self.size.value
+        if index >= self.capacity:
+            return -1
+        self.parent[index] = parent
+        self.cell[index] = cell
+        self.visits[index] = 0
+        self.wins[index] = 0.0
+        self.first_child[index] = NO_CHILDREN
+        self.child_count[index] = 0
+        self.status[index] = UNKNOWN
+        self.size.value = index + 1
+        return index
+
+    def expand(self, node, cells):
+        """Give ``node`` one child per cell, in order; False, marking ``node`` FULL, if there is no room"""
+        if self.size.value + len(cells) > self.capacity:
+            self.status[node] = FULL
+            return False
+        start = self.size.value
+        for cell in cells:
+            self.add(node, cell)
+        self.child_count[node] = len(cells)
+        self.first_child[node] = start
+        return True
+
+    def children(self, node):
+        start = self.first_child[node]
+        return range(start, start + self.child_count[node]) if start != NO_CHILDREN else range(0)
+
+
+class SharedTreeMCTS(MCTS):
+    """MCTS growing a SharedNodeStore alongside other processes, under ``lock`` and with virtual loss"""
+
+    def __init__(self, board, store, lock, virtual_loss=VIRTUAL_LOSS, **options):
+        super().__init__(board, **options)
+        self.store = store
+        self.lock = lock
+        self.virtual_loss = virtual_loss
+
+    def _playout(self, x, o, side):
+        visits = self.store.visits
+        with self.lock:
+            path, pieces, mover, state = self._select(x, o, side)
+            for node in path:
+                visits[node] += self.virtual_loss
+        winner = self._finish(pieces, mover, state)
+        with self.lock:
+            for node in path:
+                visits[node] -= self.virtual_loss
+            self._backup(path, side, winner)
+
+
+_engine = None
+_shared = False
+_abort = None
+
+
+def _init_worker(board, options, store, lock, virtual_loss, abort):
+    global _engine, _shared, _abort
+    # Spawned workers must not repeat each other's rollouts
+    options = dict(options, rng=random.Random())
+    if store is not None:
+        _engine = SharedTreeMCTS(board, store, lock, virtual_loss, **options)
+    else:
+        _engine = MCTS(board, **options)
+    _shared = store is not None
+    _abort = abort
+
+
+def _grow(x, o, side, free, budget, deadline):
+    """
+    Playouts of one worker. In root mode it grows a new tree of its own
+    and returns its root moves as (cell, visits, wins) with its
+    SearchStats; in tree mode it grows the shared tree and returns None
+    and its SearchStats. ``deadline`` is wall clock time, the one clock
+    the processes share.
+    """
+    engine = _engine
+    engine.stats = SearchStats()
+    if not _shared:
+        engine.new_root(free)
+    local_deadline = time.perf_counter() + deadline - time.time() if deadline is not None else None
+    engine.stats.playouts = engine.grow(x, o, side, budget, local_deadline, _abort)
+    if _shared:
+        return None, engine.stats
+    engine.stats.nodes = len(engine.store)
+    return engine.root_children(), engine.stats
+
+
+class ParallelMCTS:
+    def __init__(self, board, workers=None, mode="root", playouts=None, time_limit=None, rollout="random",
+                 exploration=EXPLORATION, capacity=CAPACITY, virtual_loss=VIRTUAL_LOSS):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}, expected one of {', '.join(MODES)}")
+        if playouts is None and time_limit is None:
+            raise ValueError("MCTS needs a playout budget, a time_limit or both to stop at")
+        if rollout not in ROLLOUTS:
+            raise ValueError(f"Unknown rollout {rollout!r}, expected one of {', '.join(ROLLOUTS)}")
+        self.board = board
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.capacity = capacity
+        self.virtual_loss = virtual_loss
+        # What every worker needs to build its MCTS; the budget is handed out per search
+        self._worker_options = dict(playouts=playouts, time_limit=time_limit, rollout=rollout,
+                                    exploration=exploration)
+        self.stats = None
+        self._pool = None
+        self._tree = None
+
+    def _start_pool(self):
+        store = lock = None
+        if self.mode == "tree":
+            store = SharedNodeStore(self.capacity, CONTEXT)
+            lock = CONTEXT.Lock()
+            # The parent's view of the shared tree, to set up its root and read the result
+            self._tree = SharedTreeMCTS(self.board, store, lock, self.virtual_loss, **self._worker_options)
+        self._pool = WorkerPool(self.workers, _init_worker,
+                                (self.board, self._worker_options, store, lock, self.virtual_loss))
+
+    def close(self):
+        """Shut the worker processes down; the next search starts new ones"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+            self._tree = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def search(self, x, o, x_to_move=True, depth=0, moves=None, cancel=None):
+        """Most visited move over every worker and its expected score for X, as MCTS.search"""
+        board = self.board
+        self.stats = SearchStats()
+        self.stats.playouts = 0
+        free = board.full ^ (x | o)
+        if moves is not None:
+            free &= moves
+        if board.is_win(x) or board.is_win(o) or not free:
+            return SearchResult(None, None, self.stats)
+
+        if self._pool is None:
+            self._start_pool()
+        if self._tree is not None:
+            self._tree.new_root(free)
+        side = 0 if x_to_move else 1
+        deadline = time.time() + self.time_limit / 1000 if self.time_limit is not None else None
+        budgets = [None] * self.workers
+        if self.playouts is not None:
+            share, extra = divmod(self.playouts, self.workers)
+            budgets = [share + (worker < extra) for worker in range(self.workers)]
+        results = self._pool.run(_grow, [(x, o, side, free, budget, deadline) for budget in budgets], cancel)
+
+        totals = {}
+        for children, stats in results:
+            self.stats.playouts += stats.playouts
+            self.stats.nodes += stats.nodes
+            self.stats.max_depth = max(self.stats.max_depth, stats.max_depth)
+            for cell, visits, wins in children or ():
+                total = totals.setdefault(cell, [0, 0.0])
+                total[0] += visits
+                total[1] += wins
+        if self._tree is not None:
+            self.stats.nodes = len(self._tree.store)
+            return MCTS.best(self._tree.root_children(), x_to_move, self.stats)
+        return MCTS.best([(cell, visits, wins) for cell, (visits, wins) in sorted(totals.items())],
+                         x_to_move, self.stats)
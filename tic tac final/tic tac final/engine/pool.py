@@ -0,0 +1,57 @@
+"""
+The process pool behind the parallel searches.
+
+WorkerPool is a ProcessPoolExecutor on the spawn start method, so it is
+safe next to the GUI's worker thread, with an abort event handed to
+every worker for it to poll. ``run`` submits one task per set of
+arguments and waits for all of them, looking at the caller's cancel
+event while it waits. If a task fails or the search is cancelled it
+sets the abort event, so the tasks still running stop early, cancels
+the ones not started yet and raises.
+
+Shared state a search hands its workers (multiprocessing Values, Locks,
+RawArrays) is created from CONTEXT, the pool's own.
+"""
+
+import multiprocessing
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+
+from engine.search import SearchCancelled
+
+# Seconds between two looks at the caller's cancel event while the workers run
+WAIT_INTERVAL = 0.05
+
+CONTEXT = multiprocessing.get_context("spawn")
+
+
+class WorkerPool:
+    def __init__(self, workers, initializer, initargs):
+        """Start ``workers`` processes, each running ``initializer(*initargs, abort)`` first"""
+        self.abort = CONTEXT.Event()
+        self._executor = ProcessPoolExecutor(workers, mp_context=CONTEXT, initializer=initializer,
+                                             initargs=(*initargs, self.abort))
+
+    def run(self, function, tasks, cancel=None):
+        """``function(*task)`` of every task on the workers, in the order of the tasks"""
+        self.abort.clear()
+        futures = [self._executor.submit(function, *task) for task in tasks]
+        try:
+            pending = futures
+            while pending:
+                done, pending = wait(pending, timeout=WAIT_INTERVAL, return_when=FIRST_EXCEPTION)
+                if cancel is not None and cancel.is_set():
+                    raise SearchCancelled
+                for future in done:
+                    # Re-raises a worker's exception here, such as a SearchTimeout
+                    future.result()
+        except BaseException:
+            self.abort.set()
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            raise
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Shut the worker processes down"""
+        self._executor.shutdown(cancel_futures=True)
@@ -0,0 +1,213 @@
+"""
+Depth-first proof-number search (df-pn) on a Board of any size.
+
+Minimax finds the value of a position by searching every line to its
+end; a proof only needs one winning answer to every defence. Proof-number
+search proves or disproves a goal, here "the attacker wins", by always
+working on the line that looks cheapest to settle: every node counts the
+leaves still to be proved (its proof number) and the leaves still to be
+disproved (its disproof number). Where the attacker moves it takes the
+smallest proof number of its children and the sum of their disproof
+numbers, and the other way round where the defender moves. df-pn
+searches it depth first, giving every child thresholds that send the
+search back up as soon as another line becomes cheaper, and keeps the
+numbers of every node it leaves in a transposition table.
+
+ProofSolver.solve settles a position with at most two proofs: that the
+side to move wins, otherwise that the opponent wins, which if disproved
+means a draw. A proof that runs past ``max_nodes`` leaves the result
+unknown. The table is kept between solves and cleared when it grows past
+``table_size`` entries.
+
+ProofSolver also has Negamax's ``search``, so a Player plays with it: a
+proven win or draw plays its move, anything else goes to the
+``fallback`` engine (or plays the first free cell without one).
+"""
+
+from collections import namedtuple
+
+from engine.search import SearchCancelled, SearchResult, SearchStats
+
+# Results for the side to move
+WIN, DRAW, LOSS = 1, 0, -1
+
+# Proof and disproof numbers of a settled node; sums are capped at it
+INFINITY = 1 << 40
+
+# Nodes between two looks at the cancel event
+CANCEL_INTERVAL = 1024
+
+# result is WIN, DRAW, LOSS or None if a proof ran out of nodes; move is the proven cell, if any
+Proof = namedtuple("Proof", ["result", "move", "nodes"])
+
+
+class ProofBudgetExceeded(Exception):
+    """Raised inside the search when a proof runs past max_nodes"""
+
+
+class ProofSolver:
+    def __init__(self, board, max_nodes=1_000_000, table_size=1_000_000, fallback=None):
+        self.board = board
+        self.max_nodes = max_nodes
+        self.table_size = table_size
+        self.fallback = fallback
+        self.table = {}  # Node key -> (proof number, disproof number)
+        self.nodes = 0
+        self.stats = None
+        self._budget = None
+        self._cancel = None
+
+    def solve(self, x, o, x_to_move=True, cancel=None):
+        """Proof of the position for the side to move, with the cell that wins or holds the draw"""
+        board = self.board
+        self.nodes = 0
+        self._cancel = cancel
+        if len(self.table) > self.table_size:
+            self.table.clear()
+        own, other = (x, o) if x_to_move else (o, x)
+        if board.is_win(other):
+            return Proof(LOSS, None, 0)
+        if board.is_win(own) or not board.full ^ (x | o):
+            return Proof(WIN if board.is_win(own) else DRAW, None, 0)
+        try:
+            won = self.prove(own, other, True)
+            if won is None:
+                return Proof(None, None, self.nodes)
+            if won:
+                return Proof(WIN, self._settled_child(own, other, True), self.nodes)
+            lost = self.prove(own, other, False)
+            if lost is None:
+                return Proof(None, None, self.nodes)
+            if lost:
+                return Proof(LOSS, None, self.nodes)
+            return Proof(DRAW, self._settled_child(own, other, False), self.nodes)
+        finally:
+            self._cancel = None
+
+    def prove(self, own, other, attacking):
+        """
+        Whether the attacker wins the position, ``own`` to move; the attacker
+        is the side to move if ``attacking``. None if it runs out of nodes.
+        """
+        self._budget = self.nodes + self.max_nodes
+        try:
+            proof, disproof = self._mid(own, other, attacking, INFINITY, INFINITY)
+        except ProofBudgetExceeded:
+            return None
+        return proof == 0
+
+    def search(self, x, o, x_to_move=True, depth=0, moves=None, cancel=None):
+        """
+        SearchResult of the solved position: a proven win or loss scores
+        the board's win_score for the winner, a draw 0. Unsolved positions
+        and lost ones are searched by the fallback, if any. ``depth`` and
+        ``moves`` are only passed on to the fallback.
+        """
+        board = self.board
+        proof = self.solve(x, o, x_to_move, cancel)
+        self.stats = SearchStats()
+        self.stats.nodes = proof.nodes
+        color = 1 if x_to_move else -1
+        if proof.move is not None and (moves is None or moves >> proof.move & 1):
+            return SearchResult(color * proof.result * board.win_score, proof.move, self.stats)
+        if self.fallback is not None:
+            result = self.fallback.search(x, o, x_to_move, depth, moves, cancel)
+            result.stats.nodes += proof.nodes
+            self.stats = result.stats
+            return result
+        free = board.full ^ (x | o)
+        if moves is not None:
+            free &= moves
+        move = (free & -free).bit_length() - 1 if free else None
+        value = color * proof.result * board.win_score if proof.result is not None else 0
+        return SearchResult(value, move, self.stats)
+
+    def _settled_child(self, own, other, attacking):
+        """Cell of a root move that keeps the proof: a win if ``attacking``, else a refutation"""
+        board = self.board
+        for cell in range(board.cells):
+            bit = 1 << cell
+            if (own | other) & bit:
+                continue
+            child = own | bit
+            if board.wins_with(child, bit):
+                if attacking:
+                    return cell
+                continue
+            if child | other == board.full:
+                if not attacking:
+                    return cell
+                continue
+            proof, disproof = self.table.get(self._key(other, child, not attacking), (1, 1))
+            if (proof if attacking else disproof) == 0:
+                return cell
+        return None
+
+    def _key(self, own, other, attacking):
+        return ((own << self.board.cells | other) << 1) | attacking
+
+    def _children(self, own, other, attacking):
+        """(key, proof, disproof) of every move: settled numbers for moves that end the game, else None"""
+        board = self.board
+        occupied = own | other
+        children = []
+        for cell in range(board.cells):
+            bit = 1 << cell
+            if occupied & bit:
+                continue
+            child = own | bit
+            if board.wins_with(child, bit):
+                # The mover won: a proof if it is the attacker
+                children.append((None, child, 0, INFINITY) if attacking else (None, child, INFINITY, 0))
+            elif child | other == board.full:
+                children.append((None, child, INFINITY, 0))
+            else:
+                children.append((self._key(other, child, not attacking), child, None, None))
+        return children
+
+    def _mid(self, own, other, attacking, proof_threshold, disproof_threshold):
+        """Search until the node's proof or disproof number reaches its threshold; returns both"""
+        self.nodes += 1
+        if self.nodes > self._budget:
+            raise ProofBudgetExceeded
+        if self._cancel is not None and not self.nodes % CANCEL_INTERVAL and self._cancel.is_set():
+            raise SearchCancelled
+
+        table = self.table
+        key = self._key(own, other, attacking)
+        children = self._children(own, other, attacking)
+        while True:
+            # The attacker needs one proved child, the defender one disproved child
+            best = None
+            best_number = second_number = INFINITY + 1
+            total = 0
+            numbers = []
+            for index, (child_key, child, proof, disproof) in enumerate(children):
+                if child_key is not None:
+                    proof, disproof = table.get(child_key, (1, 1))
+                numbers.append((proof, disproof))
+                select, add = (proof, disproof) if attacking else (disproof, proof)
+                total = min(total + add, INFINITY)
+                if select < best_number:
+                    second_number = best_number
+                    best_number = select
+                    best = index
+                elif select < second_number:
+                    second_number = select
+            if attacking:
+                proof, disproof = best_number, total
+            else:
+                proof, disproof = total, best_number
+            if proof >= proof_threshold or disproof >= disproof_threshold or not proof or not disproof:
+                table[key] = (proof, disproof)
+                return proof, disproof
+
+            child_key, child, _, _ = children[best]
+            child_proof, child_disproof = numbers[best]
+            if attacking:
+                child_proof_threshold = min(proof_threshold, second_number + 1)
+                child_disproof_threshold = disproof_threshold - disproof + child_disproof
+            else:
+                child_disproof_threshold = min(disproof_threshold, second_number + 1)
+                child_proof_threshold = proof_threshold - proof + child_proof
+            self._mid(other, child, not attacking, child_proof_threshold, child_disproof_threshold)
@@ -0,0 +1,356 @@
+"""
+Negamax search on (x, o) bitboards, shared by every variant.
+
+Scores follow the GUI variants: 10 - depth when X wins, depth - 10 when O
+wins and 0 for a draw, all from X's (the AI's) point of view. Inside the
+search a node scores the position for the side to move, so one loop
+serves both players.
+
+A Negamax is configured once per game with an evaluation strategy and the
+optimizations it uses, and ``search`` returns the value, the best move and
+the statistics of one decision:
+
+- evaluation / max_depth: score positions at ``max_depth`` with
+  ``evaluation(x, o)`` instead of searching to the end of the game
+- alphabeta: prune with an (alpha, beta) window; off for plain minimax
+- table: a TranspositionTable, keyed on the Zobrist hash of each node
+- ordering: a MoveOrdering for every node below the root
+- symmetry: skip moves leading to a rotation or reflection of a sibling,
+  and key the table on the symmetric hash, in positions of at most
+  SYMMETRY_PIECES pieces; deeper, the plain hash is cheaper than the
+  siblings it would skip
+- root_bonus: ``root_bonus(x, o)`` added to the value of each root move
+- tablebase: a Tablebase answering the root moves of exact searches
+- time_limit: search depth-limited positions by iterative deepening until
+  this many milliseconds have passed, keeping the move of the deepest
+  completed iteration; max_depth then caps the depth, if given
+- stats: collect SearchStats for every search (time-limited searches
+  always do, the clock is read by node count)
+
+``search`` also takes a ``cancel`` event (anything with ``is_set()``, such
+as a threading.Event): a search running on another thread polls it with
+the clock and raises SearchCancelled once it is set. Polling rides on the
+node count, so it needs an engine that collects stats.
+
+The counters are added by wrapping the node function, the evaluation and
+the cutoff hook when the engine is created, so a Negamax built with
+stats=False runs the bare search loop.
+"""
+
+import math
+import time
+from collections import namedtuple
+from operator import xor
+
+from engine.bitboard import FULL, POPCOUNT, WINNING
+from engine.zobrist import O, O_MOVE_KEYS, SYMMETRIC_MOVE_KEYS, X, X_MOVE_KEYS, hash_position, symmetric_hashes
+
+
+def _moves_table():
+    """Bits of every free-cell mask in row-major order"""
+    table = [()] * (FULL + 1)
+    for mask in range(1, FULL + 1):
+        low = mask & -mask
+        table[mask] = (low,) + table[mask ^ low]
+    return tuple(table)
+
+
+MOVES = _moves_table()
+
+SearchResult = namedtuple("SearchResult", ["value", "move", "stats"])
+
+
+class SearchStats:
+    def __init__(self):
+        self.nodes = 0
+        self.leaves = 0
+        self.cutoffs = 0
+        self.max_depth = 0  # Deepest recursion below the root, its children being 1
+        self.cache_hits = 0  # Transposition table and tablebase answers
+        self.peak_memory = None  # tracemalloc peak in bytes, filled in by a benchmark that traces
+        self.depth = None  # Plies looked ahead by the deepest completed iteration
+        self.book = False  # Move read from the opening book instead of searched
+        self.rule = False  # Move chosen by one of a Player's rules instead of searched
+        self.playouts = None  # Games played out by a Monte Carlo search
+
+    def __str__(self):
+        text = (f"{self.nodes} nodes, {self.leaves} leaf evaluations, {self.cutoffs} cutoffs, "
+                f"max depth {self.max_depth}, {self.cache_hits} cache hits")
+        if self.peak_memory is not None:
+            text += f", peak {self.peak_memory} bytes"
+        if self.depth is not None:
+            text += f", depth {self.depth}"
+        if self.playouts is not None:
+            text += f", {self.playouts} playouts"
+        if self.book:
+            text += ", opening book move"
+        if self.rule:
+            text += ", rule move"
+        return text
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when an iteration runs past the deadline"""
+
+
+class SearchCancelled(Exception):
+    """Raised out of ``search`` when its cancel event is set"""
+
+
+class Negamax:
+    # Nodes searched between two looks at the clock
+    CLOCK_INTERVAL = 256
+
+    # Most pieces of a position searched with symmetry reduction. Past the first plies few positions
+    # have a symmetry left, and the 8 hashes of every node cost more time than the siblings they skip.
+    SYMMETRY_PIECES = 3
+
+    def __init__(self, evaluation=None, max_depth=None, alphabeta=True, table=None, ordering=None,
+                 symmetry=False, root_bonus=None, tablebase=None, time_limit=None, stats=True):
+        if evaluation is not None and max_depth is None and time_limit is None:
+            raise ValueError("An evaluation needs a max_depth or a time_limit to be applied at")
+        if time_limit is not None and evaluation is None:
+            raise ValueError("A time_limit needs an evaluation for the positions it does not reach")
+        if evaluation is not None and table is not None:
+            raise ValueError("Depth-limited values cannot be shared through a transposition table")
+        self.evaluation = evaluation
+        self.max_depth = max_depth
+        self.alphabeta = alphabeta
+        self.table = table
+        self.ordering = ordering
+        self.symmetry = symmetry
+        self.root_bonus = root_bonus
+        self.tablebase = tablebase
+        self.time_limit = time_limit
+        # Without a depth limit a win is the best score, so a winning move ends the loop
+        self.exact = evaluation is None
+        self.collect_stats = stats or time_limit is not None
+        self.stats = None
+        self._limit = max_depth
+        self._deadline = None
+        self._cancel = None
+        self._root_depth = 0
+
+        self._evaluate = evaluation
+        self._on_cutoff = ordering.cutoff if ordering is not None else None
+        # The class's node function, which the counting wrapper calls
+        self._bare_search = self._search
+        if self.collect_stats:
+            # Instance attributes shadow the bare methods for the whole search
+            self._search = self._counted_search
+            if evaluation is not None:
+                self._evaluate = self._counted_evaluation
+            self._on_cutoff = self._counted_cutoff
+
+    def search(self, x, o, x_to_move=True, depth=0, moves=None, cancel=None):
+        """
+        Best move for the side to move and its value.
+
+        As in the GUI root loops, the positions after each root move are
+        searched at ``depth``. ``moves`` restricts the root to a mask of
+        cells. The move is a cell index, the first best in row-major order,
+        or None if no move is left.
+        """
+        if cancel is not None and not self.collect_stats:
+            raise ValueError("Cancelling a search needs its node count, create the engine with stats=True")
+        self._cancel = cancel
+        self.stats = SearchStats() if self.collect_stats else None
+        self._root_depth = depth
+        if self.table is not None:
+            self.table.reset_counters()
+        if self.ordering is not None:
+            self.ordering.new_search()
+
+        try:
+            if self.time_limit is None:
+                self._limit = self.max_depth
+                self._deadline = None
+                result = self._search_root(x, o, x_to_move, depth, moves)
+            else:
+                result = self._deepen(x, o, x_to_move, depth, moves)
+        finally:
+            self._cancel = None
+
+        if self.collect_stats and self.table is not None:
+            self.stats.cache_hits += self.table.hits
+        return result
+
+    def _deepen(self, x, o, x_to_move, depth, moves):
+        """Iterative deepening: one ply more per iteration until the deadline"""
+        deadline = time.perf_counter() + self.time_limit / 1000
+        # Past this many plies every line has reached the end of the game
+        remaining = self._free_count(x, o)
+        result = None
+        plies = 1
+        while True:
+            self._limit = depth + plies - 1
+            # The first iteration always completes so there is a move to play
+            self._deadline = deadline if result is not None else None
+            try:
+                result = self._search_root(x, o, x_to_move, depth, moves)
+            except SearchTimeout:
+                break
+            self.stats.depth = plies
+            if result.move is None or plies >= remaining or time.perf_counter() >= deadline:
+                break
+            if self.max_depth is not None and self._limit >= self.max_depth:
+                break
+            plies += 1
+        self._deadline = None
+        return result
+
+    def _search_root(self, x, o, x_to_move, depth, moves):
+        color = 1 if x_to_move else -1
+        own, other = (x, o) if x_to_move else (o, x)
+        free = FULL ^ (x | o)
+        if moves is not None:
+            free &= moves
+        if WINNING[x] or WINNING[o] or not free:
+            return SearchResult(None, None, self.stats)
+
+        key = self._root_key(x, o, x_to_move)
+        use_tablebase = self.tablebase is not None and self.exact
+        symmetric = key.__class__ is tuple
+        leaving = symmetric and POPCOUNT[x | o] >= self.SYMMETRY_PIECES
+
+        alpha = -math.inf
+        beta = math.inf
+        best = -math.inf
+        best_move = None
+        seen = set()
+        for bit in MOVES[free]:
+            child = own | bit
+            child_key = self._child_key(key, color, bit)
+            if symmetric:
+                form = min(child_key)
+                if form in seen:
+                    continue
+                seen.add(form)
+                if leaving:
+                    child_key = self._plain_key(child_key)
+
+            if self.exact and WINNING[child]:
+                return SearchResult(color * (10 - depth), bit.bit_length() - 1, self.stats)
+            if use_tablebase:
+                cx, co = (child, other) if x_to_move else (other, child)
+                val = color * self.tablebase.value(cx, co, not x_to_move, depth)
+                if self.collect_stats:
+                    self.stats.cache_hits += 1
+            else:
+                val = -self._search(other, child, depth, -beta, -alpha, -color, child_key)
+            if self.root_bonus is not None:
+                cx, co = (child, other) if x_to_move else (other, child)
+                val += color * self.root_bonus(cx, co)
+            if val > best:
+                best = val
+                best_move = bit.bit_length() - 1
+                # A root bonus changes the values after the search, so every root move needs a full window
+                if self.alphabeta and self.root_bonus is None and val > alpha:
+                    alpha = val
+        return SearchResult(color * best, best_move, self.stats)
+
+    def _free_count(self, x, o):
+        return POPCOUNT[FULL ^ (x | o)]
+
+    def _root_key(self, x, o, x_to_move):
+        """Hash threaded down the tree: the 8 symmetric hashes, the plain one for a table, or None"""
+        if self.symmetry and POPCOUNT[x | o] <= self.SYMMETRY_PIECES:
+            return symmetric_hashes(x, o, x_to_move)
+        if self.table is not None:
+            return hash_position(x, o, x_to_move)
+        return None
+
+    def _child_key(self, key, color, bit):
+        if key is None:
+            return None
+        if key.__class__ is tuple:
+            return tuple(map(xor, key, SYMMETRIC_MOVE_KEYS[X if color > 0 else O][bit]))
+        return key ^ (X_MOVE_KEYS if color > 0 else O_MOVE_KEYS)[bit]
+
+    def _plain_key(self, key):
+        """
+        Key of a position past SYMMETRY_PIECES, from its 8 symmetric hashes:
+        the identity's, the first, if there is a table. A table keyed on
+        both is still right, symmetric positions having the same value.
+        """
+        return key[0] if self.table is not None else None
+
+    def _counted_search(self, own, other, depth, alpha, beta, color, key):
+        """_search that counts the node and watches the deadline and the cancel event"""
+        stats = self.stats
+        stats.nodes += 1
+        level = depth - self._root_depth + 1
+        if level > stats.max_depth:
+            stats.max_depth = level
+        if not stats.nodes % self.CLOCK_INTERVAL:
+            if self._cancel is not None and self._cancel.is_set():
+                raise SearchCancelled
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                raise SearchTimeout
+        return self._bare_search(own, other, depth, alpha, beta, color, key)
+
+    def _counted_evaluation(self, x, o):
+        self.stats.leaves += 1
+        return self.evaluation(x, o)
+
+    def _counted_cutoff(self, bit, index, ply, side, remaining):
+        self.stats.cutoffs += 1
+        if self.ordering is not None:
+            self.ordering.cutoff(bit, index, ply, side, remaining)
+
+    def _search(self, own, other, depth, alpha, beta, color, key):
+        """Value of the position for the side to move (``own``); ``other`` has just moved"""
+        if WINNING[other]:
+            return depth - 10
+        free = FULL ^ (own | other)
+        if not free:
+            return 0
+        if self._limit is not None and depth >= self._limit:
+            return color * (self._evaluate(own, other) if color > 0 else self._evaluate(other, own))
+
+        table = self.table
+        symmetric = key.__class__ is tuple
+        if table is not None:
+            probe = min(key) if symmetric else key
+            value = table.lookup(probe, depth, alpha, beta)
+            if value is not None:
+                return value
+
+        ordering = self.ordering
+        on_cutoff = self._on_cutoff
+        side = X if color > 0 else O
+        moves = MOVES[free] if ordering is None else ordering.order(free, depth, side)
+        alpha_orig = alpha
+        exact = self.exact
+        seen = set() if symmetric else None
+        leaving = symmetric and POPCOUNT[own | other] >= self.SYMMETRY_PIECES
+        child_key = None
+        best = -math.inf
+        for index, bit in enumerate(moves):
+            child = own | bit
+            if exact and WINNING[child]:
+                best = 9 - depth
+                break
+            if key is not None:
+                child_key = self._child_key(key, color, bit)
+                if seen is not None:
+                    form = min(child_key)
+                    if form in seen:
+                        continue
+                    seen.add(form)
+                    if leaving:
+                        child_key = self._plain_key(child_key)
+
+            val = -self._search(other, child, depth + 1, -beta, -alpha, -color, child_key)
+            if val > best:
+                best = val
+                if self.alphabeta and val > alpha:
+                    alpha = val
+                    if alpha >= beta:
+                        if on_cutoff is not None:
+                            on_cutoff(bit, index, depth, side, POPCOUNT[free])
+                        break
+
+        if table is not None:
+            table.store(probe, depth, best, alpha_orig, beta)
+        return best
@@ -0,0 +1,60 @@
+"""
+The 8 rotations and reflections of the 3x3 board.
+
+Every transform is a permutation of the 9 cells, expanded into a 512-entry
+table so a whole bitboard is transformed with one lookup. The canonical
+form of a position is the smallest (x, o) pair over all 8 transforms;
+positions that are rotations or reflections of each other share it and
+have the same minimax value.
+"""
+
+from engine.bitboard import CELLS, SIZE
+
+# Each transform maps (row, col) to a new (row, col); n is the last index
+SYMMETRIES = (
+    lambda r, c, n: (r, c),          # Identity
+    lambda r, c, n: (c, n - r),      # Rotate 90
+    lambda r, c, n: (n - r, n - c),  # Rotate 180
+    lambda r, c, n: (n - c, r),      # Rotate 270
+    lambda r, c, n: (r, n - c),      # Mirror left-right
+    lambda r, c, n: (n - r, c),      # Mirror top-bottom
+    lambda r, c, n: (c, r),          # Main diagonal
+    lambda r, c, n: (n - c, n - r),  # Anti-diagonal
+)
+
+
+def _permutation(symmetry):
+    """Cell index each cell is moved to by ``symmetry``"""
+    permutation = [0] * CELLS
+    for row in range(SIZE):
+        for col in range(SIZE):
+            new_row, new_col = symmetry(row, col, SIZE - 1)
+            permutation[row * SIZE + col] = new_row * SIZE + new_col
+    return tuple(permutation)
+
+
+def _transform_table(permutation):
+    """Transformed mask of every 9-bit mask"""
+    table = [0] * (1 << CELLS)
+    for mask in range(1, 1 << CELLS):
+        # The mask without its lowest cell is already transformed
+        low = mask & -mask
+        table[mask] = table[mask ^ low] | 1 << permutation[low.bit_length() - 1]
+    return tuple(table)
+
+
+PERMUTATIONS = tuple(_permutation(symmetry) for symmetry in SYMMETRIES)
+
+TRANSFORMS = tuple(_transform_table(permutation) for permutation in PERMUTATIONS)
+
+_canonical_cache = {}
+
+
+def canonical(x, o):
+    """Smallest (x, o) over the 8 symmetries of the position"""
+    key = (x, o)
+    form = _canonical_cache.get(key)
+    if form is None:
+        form = min((table[x], table[o]) for table in TRANSFORMS)
+        _canonical_cache[key] = form
+    return form
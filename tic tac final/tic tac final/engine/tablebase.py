@@ -0,0 +1,193 @@
+"""
+Precomputed perfect-play tablebase.
+
+Every position reachable with either side moving first is solved once and
+written to a binary file with one record per (position, side to move).
+A record holds the node-relative minimax value (see engine.transposition)
+and a 9-bit mask of the moves that reach it. The loader memory-maps the
+file read-only, so every game process shares the same pages and a move
+decision is a single record read.
+
+Build the file with:
+
+    python -m engine.tablebase
+
+and check it against independent proofs of every position's result
+(engine.proof) with:
+
+    python -m engine.tablebase --check
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+from engine.bitboard import CELLS, FULL, WINNING
+from engine.transposition import from_table
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase.bin")
+
+MAGIC = b"TTTBASE1"
+RECORD = struct.Struct("<bH")  # value, best-move mask
+UNSOLVED = -128
+POSITIONS = 3 ** CELLS
+
+# Base-3 digit sum of every mask, so a position index is BASE3[x] + 2 * BASE3[o]
+BASE3 = tuple(
+    sum(3 ** cell for cell in range(CELLS) if mask >> cell & 1) for mask in range(1 << CELLS)
+)
+
+
+def record_offset(x, o, x_to_move):
+    index = (BASE3[x] + 2 * BASE3[o]) * 2 + (0 if x_to_move else 1)
+    return len(MAGIC) + index * RECORD.size
+
+
+def solve():
+    """Solve all reachable positions; maps (x, o, x_to_move) to (value, move mask)"""
+    solved = {}
+
+    def solve_node(x, o, x_to_move):
+        key = (x, o, x_to_move)
+        if key in solved:
+            return solved[key][0]
+
+        if WINNING[x]:
+            result = (10, 0)
+        elif WINNING[o]:
+            result = (-10, 0)
+        elif x | o == FULL:
+            result = (0, 0)
+        else:
+            best = None
+            moves = 0
+            free = FULL ^ (x | o)
+            while free:
+                bit = free & -free
+                free ^= bit
+                if x_to_move:
+                    val = from_table(solve_node(x | bit, o, False), 1)
+                else:
+                    val = from_table(solve_node(x, o | bit, True), 1)
+
+                if best is None or (val > best if x_to_move else val < best):
+                    best = val
+                    moves = bit
+                elif val == best:
+                    moves |= bit
+            result = (best, moves)
+
+        solved[key] = result
+        return result[0]
+
+    solve_node(0, 0, True)
+    solve_node(0, 0, False)
+    return solved
+
+
+def build(path=DEFAULT_PATH):
+    """Solve every position and write the tablebase file; returns the position count"""
+    data = bytearray(MAGIC) + RECORD.pack(UNSOLVED, 0) * (POSITIONS * 2)
+    solved = solve()
+    for (x, o, x_to_move), (value, moves) in solved.items():
+        RECORD.pack_into(data, record_offset(x, o, x_to_move), value, moves)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return len(solved)
+
+
+class Tablebase:
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(MAGIC)] != MAGIC:
+            self.data.close()
+            raise ValueError(f"{path} is not a tablebase file")
+
+    def record(self, x, o, x_to_move):
+        value, moves = RECORD.unpack_from(self.data, record_offset(x, o, x_to_move))
+        if value == UNSOLVED:
+            raise KeyError(f"Position x={x:09b} o={o:09b} is not reachable")
+        return value, moves
+
+    def value(self, x, o, x_to_move, depth=0):
+        """Minimax value of the position as a search at ``depth`` would return it"""
+        return from_table(self.record(x, o, x_to_move)[0], depth)
+
+    def best_moves(self, x, o, x_to_move):
+        """Cells that keep the minimax value, in row-major order"""
+        moves = self.record(x, o, x_to_move)[1]
+        return [cell for cell in range(CELLS) if moves >> cell & 1]
+
+    def best_move(self, x, o, x_to_move):
+        """First best cell in row-major order, or None if the game is over"""
+        moves = self.record(x, o, x_to_move)[1]
+        if not moves:
+            return None
+        return (moves & -moves).bit_length() - 1
+
+    def close(self):
+        self.data.close()
+
+
+def check(table, solver=None):
+    """
+    Positions whose win, draw or loss in ``table`` a ProofSolver proves
+    otherwise, or whose best moves it shows do not keep that result, as
+    (x, o, x_to_move, tablebase value, proven result) tuples.
+    """
+    # The solver plays on the generalized board, which imports the variants
+    from engine.nxn import Board
+    from engine.proof import ProofSolver
+
+    solver = solver or ProofSolver(Board(3, 3, 3))
+    mismatches = []
+    for x in range(1 << CELLS):
+        for o in range(1 << CELLS):
+            if x & o:
+                continue
+            for x_to_move in (True, False):
+                value, moves = RECORD.unpack_from(table.data, record_offset(x, o, x_to_move))
+                if value == UNSOLVED:
+                    continue
+                result = solver.solve(x, o, x_to_move).result
+                expected = (value > 0) - (value < 0)
+                if not x_to_move:
+                    expected = -expected
+                if result != expected:
+                    mismatches.append((x, o, x_to_move, value, result))
+                    continue
+                for cell in range(CELLS):
+                    if moves >> cell & 1:
+                        cx, co = (x | 1 << cell, o) if x_to_move else (x, o | 1 << cell)
+                        if -solver.solve(cx, co, not x_to_move).result != result:
+                            mismatches.append((x, o, x_to_move, value, result))
+                            break
+    return mismatches
+
+
+_loaded = {}
+
+
+def load(path=DEFAULT_PATH):
+    """Shared Tablebase for ``path``, or None if the file has not been built yet"""
+    if path not in _loaded:
+        _loaded[path] = Tablebase(path) if os.path.isfile(path) else None
+    return _loaded[path]
+
+
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if argument != "--check"]
+    path = arguments[0] if arguments else DEFAULT_PATH
+    if "--check" in sys.argv[1:]:
+        mismatches = check(Tablebase(path))
+        for x, o, x_to_move, value, result in mismatches:
+            print(f"x={x:09b} o={o:09b} {'X' if x_to_move else 'O'} to move: value {value}, proved {result}")
+        print(f"{len(mismatches)} positions disagree with their proofs")
+        sys.exit(1 if mismatches else 0)
+    count = build(path)
+    print(f"Solved {count} positions, wrote {os.path.getsize(path)} bytes to {path}")
@@ -0,0 +1,182 @@
+"""
+Threat-space search: forced wins built only from threats.
+
+On long-line boards most moves are quiet, while games are decided by
+sequences of threats the opponent must answer. ThreatSearch looks only
+at those. In the names of k-in-a-row games, with k the win length:
+
+- a four is a move after which the attacker wins next move unless the
+  cell is blocked: a line holding k - 1 of its pieces and one empty cell.
+  The defender's reply is forced, so a four costs one node, not a search
+  of every reply. Two fours at once cannot both be blocked.
+- a three is a move after which the attacker would have a sequence of
+  fours if the defender passed. The defender has several answers, so
+  every reply is tried and the attacker must still win after each one.
+
+A forced win by fours alone is found first; threes are tried at most
+``threes`` deep. If the defender has a four of its own the attacker
+may only block it, and only with a four. Every line is checked against
+every reply it allows, so a sequence found is a forced win; one that is
+not found may still exist beyond the node budget or the depths searched.
+
+ThreatSearch is a rule for a Player: it is called with the position,
+X to move, before the main search runs, and returns the first move of a
+forced win or None. It counts how often it was asked, how often it
+found a win and so cut the main search off, and the time it took:
+
+    from engine.nxn import Board, create
+    player = create("heuristic", Board(7, 7, 5))
+    player.move(x, o)
+    threats = player.rules[0]
+    threats.hits / threats.probes
+"""
+
+import time
+
+from engine.nxn import bits, popcount
+
+# Nodes a single call may search
+MAX_NODES = 5000
+
+# Attacker fours in a row a sequence of fours may use
+FOUR_DEPTH = 12
+
+# Threes a forced win may start with before it goes on by fours
+THREE_DEPTH = 1
+
+
+class ThreatBudgetExceeded(Exception):
+    """Raised inside the search when a call runs past max_nodes"""
+
+
+class ThreatSearch:
+    def __init__(self, board, max_nodes=MAX_NODES, fours=FOUR_DEPTH, threes=THREE_DEPTH):
+        self.board = board
+        self.max_nodes = max_nodes
+        self.fours = fours
+        self.threes = threes
+        self.probes = 0
+        self.hits = 0
+        self.seconds = 0.0
+        self.nodes = 0
+        self._budget = None
+        self._failed = {}  # (attacker, defender) -> most fours a win by fours was not found within
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def __call__(self, x, o):
+        """First move of a forced win for X, or None"""
+        start = time.perf_counter()
+        self.probes += 1
+        try:
+            sequence = self.find(x, o)
+        finally:
+            self.seconds += time.perf_counter() - start
+        if sequence is None:
+            return None
+        self.hits += 1
+        return sequence[0]
+
+    def find(self, attacker, defender):
+        """
+        Cells of a forced win for ``attacker``, to move, or None. A win by
+        fours comes with every move of both sides; one starting with a
+        three only with its first move, the rest depends on the reply.
+        """
+        board = self.board
+        if board.is_win(attacker) or board.is_win(defender) or not board.full ^ (attacker | defender):
+            return None
+        self._budget = self.nodes + self.max_nodes
+        self._failed.clear()
+        try:
+            return self._threat_win(attacker, defender, self.threes, self.winning_cells(defender, attacker))
+        except ThreatBudgetExceeded:
+            return None
+
+    def winning_cells(self, own, other):
+        """Mask of the empty cells that complete a line for ``own``"""
+        cells = 0
+        need = self.board.k - 1
+        for line in self.board.lines:
+            if not line & other and popcount(line & own) == need:
+                cells |= line & ~own
+        return cells
+
+    def _new_wins(self, own, other, bit):
+        """Mask of the cells completing a line for ``own`` through its move at ``bit``"""
+        cells = 0
+        need = self.board.k - 1
+        for line in self.board.lines_through[bit]:
+            if not line & other and popcount(line & own) == need:
+                cells |= line & ~own
+        return cells
+
+    def _candidates(self, own, other, pieces):
+        """Mask of the empty cells on a line holding ``pieces`` of ``own`` and none of ``other``"""
+        cells = 0
+        for line in self.board.lines:
+            if not line & other and popcount(line & own) == pieces:
+                cells |= line & ~own
+        return cells
+
+    def _count(self):
+        self.nodes += 1
+        if self.nodes > self._budget:
+            raise ThreatBudgetExceeded
+
+    def _fours(self, attacker, defender, depth, threats):
+        """Cells of a win by fours alone, attacker to move; ``threats`` are the defender's winning cells"""
+        self._count()
+        wins = self.winning_cells(attacker, defender)
+        if wins:
+            return [(wins & -wins).bit_length() - 1]
+        if depth == 0 or popcount(threats) > 1:
+            return None
+        key = (attacker, defender)
+        if self._failed.get(key, -1) >= depth:
+            return None
+
+        # A defender four leaves only its cell to play
+        candidates = threats if threats else self._candidates(attacker, defender, self.board.k - 2)
+        for bit in bits(candidates):
+            own = attacker | bit
+            wins = self._new_wins(own, defender, bit)
+            if not wins:
+                continue
+            cell = bit.bit_length() - 1
+            if wins & (wins - 1):
+                # Two winning cells, one block
+                return [cell]
+            blocked = defender | wins
+            rest = self._fours(own, blocked, depth - 1, self._new_wins(blocked, own, wins))
+            if rest is not None:
+                return [cell, wins.bit_length() - 1] + rest
+        self._failed[key] = depth
+        return None
+
+    def _threat_win(self, attacker, defender, threes, threats):
+        """Cells of a forced win by fours, or starting with up to ``threes`` threes"""
+        sequence = self._fours(attacker, defender, self.fours, threats)
+        if sequence is not None or threes == 0 or threats:
+            return sequence
+
+        board = self.board
+        for bit in bits(self._candidates(attacker, defender, board.k - 3)):
+            own = attacker | bit
+            # A three is a move that would win by fours if the defender passed
+            if self._fours(own, defender, self.fours, 0) is None:
+                continue
+            empty = board.full ^ (own | defender)
+            for reply in bits(empty):
+                self._count()
+                blocked = defender | reply
+                if board.wins_with(blocked, reply):
+                    break
+                if self._threat_win(own, blocked, threes - 1, self.winning_cells(blocked, own)) is None:
+                    break
+            else:
+                if empty:
+                    return [bit.bit_length() - 1]
+        return None
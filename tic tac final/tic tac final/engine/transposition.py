@@ -0,0 +1,76 @@
+"""
+Transposition table for the alpha-beta searches.
+
+Entries are keyed on the position's Zobrist hash (see engine.zobrist) and
+hold the search value plus a bound flag. Values are stored relative to the node (10 - plies to the
+result for an X win, plies - 10 for an O win), so a position reached at a
+different depth can reuse them after shifting back.
+"""
+
+EXACT = 0
+LOWER = 1  # Search failed high: the true value is at least the stored one
+UPPER = 2  # Search failed low: the true value is at most the stored one
+
+
+def to_table(value, depth):
+    """Shift a search value at ``depth`` to a node-relative value"""
+    if value > 0:
+        return value + depth
+    if value < 0:
+        return value - depth
+    return value
+
+
+def from_table(value, depth):
+    """Shift a node-relative value back to a search value at ``depth``"""
+    if value > 0:
+        return value - depth
+    if value < 0:
+        return value + depth
+    return value
+
+
+class TranspositionTable:
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def lookup(self, key, depth, alpha, beta):
+        """Stored value if it is exact or its bound cuts the (alpha, beta) window, else None"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            value, flag = entry
+            value = from_table(value, depth)
+            if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, value, alpha, beta):
+        """Store the value a search of window (alpha, beta) returned"""
+        if value <= alpha:
+            flag = UPPER
+        elif value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.entries[key] = (to_table(value, depth), flag)
+        self.stores += 1
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.reset_counters()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __str__(self):
+        return f"{self.hits} hits, {self.misses} misses, {self.stores} stores, {len(self.entries)} entries"
@@ -0,0 +1,209 @@
+"""
+The AI of every game variant, without the GUI.
+
+A Player is a variant's Negamax configuration plus the rules it tries
+before searching (take the center, take a corner, win or block at once).
+``move(x, o)`` returns the cell X (the AI) plays and the SearchStats of
+the decision, so a variant can run headless on a server, in a benchmark
+or in a tournament:
+
+    from engine.variants import create
+    player = create("minimax_alpha_beta")
+    cell, stats = player.move(x, o)
+
+VARIANTS holds the stand-alone scripts the menu launches, MODERN_VARIANTS
+the variant types of the modern game board. Keyword options are passed on
+to Negamax, e.g. ``create("minimax", stats=False)``.
+
+If the opening book has been built (see engine.book), a created Player
+plays the first moves from it instead of searching; ``book=False``
+creates one that always searches.
+"""
+
+from functools import partial
+
+from engine import book as opening_book
+from engine import tablebase
+from engine.bitboard import CELL_BITS, FULL, WINNING
+from engine.evaluation import (
+    CENTER,
+    CORNERS,
+    center_control,
+    corner_control,
+    corner_defense,
+    line_potential,
+    threat_score,
+)
+from engine.ordering import MoveOrdering
+from engine.search import MOVES, Negamax, SearchStats
+from engine.transposition import TranspositionTable
+
+# Milliseconds the heuristic variants may think per move
+HEURISTIC_TIME_LIMIT_MS = 100
+
+CORNER_CELLS = (0, 2, 6, 8)
+
+
+def take_center(x, o):
+    return 4 if not (x | o) & CENTER else None
+
+
+def take_corner(x, o):
+    """The first free corner, top-left to bottom-right"""
+    for cell in CORNER_CELLS:
+        if not (x | o) & CELL_BITS[cell]:
+            return cell
+    return None
+
+
+def win_now(x, o):
+    """The first cell that completes a line for X"""
+    for bit in MOVES[FULL ^ (x | o)]:
+        if WINNING[x | bit]:
+            return bit.bit_length() - 1
+    return None
+
+
+def block_now(x, o):
+    """The first cell that O would complete a line with"""
+    for bit in MOVES[FULL ^ (x | o)]:
+        if WINNING[o | bit]:
+            return bit.bit_length() - 1
+    return None
+
+
+def corners_while_free(x, o):
+    """Root moves limited to the corners while one is free"""
+    return CORNERS if CORNERS & ~(x | o) else None
+
+
+class Player:
+    def __init__(self, engine, rules=(), root_moves=None, book=None):
+        self.engine = engine
+        self.rules = rules
+        self.root_moves = root_moves
+        self.book = book  # OpeningBook tried after the rules, before searching
+
+    def move(self, x, o, cancel=None):
+        """
+        (cell, SearchStats) of X's move; the stats are empty but for their
+        ``rule`` or ``book`` flag when a rule or the book chose the cell.
+        ``cancel`` is passed on to Negamax.search.
+        """
+        for rule in self.rules:
+            cell = rule(x, o)
+            if cell is not None:
+                stats = SearchStats()
+                stats.rule = True
+                return cell, stats
+        if self.book is not None:
+            cell = self.book.move(x, o)
+            if cell is not None:
+                stats = SearchStats()
+                stats.book = True
+                return cell, stats
+        moves = self.root_moves(x, o) if self.root_moves is not None else None
+        result = self.engine.search(x, o, moves=moves, cancel=cancel)
+        return result.move, result.stats
+
+
+def alpha_beta(**options):
+    return Negamax(table=TranspositionTable(), ordering=MoveOrdering(), tablebase=tablebase.load(), **options)
+
+
+def minimax(**options):
+    return Negamax(alphabeta=False, tablebase=tablebase.load(), **options)
+
+
+def symmetric_minimax(**options):
+    return Negamax(alphabeta=False, symmetry=True, table=TranspositionTable(), tablebase=tablebase.load(), **options)
+
+
+def center_minimax(**options):
+    return Negamax(alphabeta=False, root_bonus=center_control, tablebase=tablebase.load(), **options)
+
+
+def timed(evaluation, **options):
+    """Iterative deepening scored by ``evaluation``, until the heuristic time limit unless options set one"""
+    options.setdefault("time_limit", HEURISTIC_TIME_LIMIT_MS)
+    return Negamax(evaluation, alphabeta=False, **options)
+
+
+VARIANTS = {
+    # The original script ran the same center-bonus minimax as Center Control with Minimax
+    "center_only": lambda **options: Player(center_minimax(**options), rules=(take_center,)),
+    "center_minimax": lambda **options: Player(center_minimax(**options), rules=(take_center,)),
+    "center_alpha_beta": lambda **options: Player(
+        Negamax(table=TranspositionTable(), ordering=MoveOrdering(), root_bonus=center_control,
+                tablebase=tablebase.load(), **options),
+        rules=(take_center,)),
+    "corner_only": lambda **options: Player(minimax(**options), rules=(take_corner, win_now, block_now)),
+    "corner_minimax": lambda **options: Player(
+        Negamax(alphabeta=False, root_bonus=corner_defense, tablebase=tablebase.load(), **options),
+        rules=(win_now, block_now, take_corner)),
+    "corner_alpha_beta": lambda **options: Player(
+        Negamax(table=TranspositionTable(), ordering=MoveOrdering(), root_bonus=corner_control,
+                tablebase=tablebase.load(), **options)),
+    "minimax": lambda **options: Player(minimax(**options)),
+    "minimax_alpha_beta": lambda **options: Player(alpha_beta(**options)),
+    "symmetry": lambda **options: Player(symmetric_minimax(**options)),
+    # Iterative deepening until the time limit, scoring the last ply with the threat heuristic
+    "heuristic": lambda **options: Player(timed(threat_score, **options)),
+}
+
+# Menu label of every stand-alone variant, as listed in menu.menu_structure
+MENU_LABELS = {
+    "center_only": "Center Control Only",
+    "center_minimax": "Center Control with Minimax",
+    "center_alpha_beta": "Center Control with Minimax & Alpha-Beta",
+    "corner_only": "Corner Control Only",
+    "corner_minimax": "Corner Control with Minimax",
+    "corner_alpha_beta": "Corner Control with Minimax & Alpha-Beta",
+    "minimax": "Basic Minimax",
+    "minimax_alpha_beta": "Minimax Alpha-Beta",
+    "symmetry": "Symmetry Reduction",
+    "heuristic": "Heuristic Reduction",
+}
+
+MODERN_VARIANTS = {
+    # One move ahead, scored by the center control heuristic
+    "center": lambda **options: Player(
+        Negamax(center_control, max_depth=0, alphabeta=False, **options), rules=(take_center,)),
+    "center_minimax": lambda **options: Player(minimax(**options), rules=(take_center,)),
+    "center_alpha_beta": lambda **options: Player(alpha_beta(**options), rules=(take_center,)),
+    # One move ahead, scored by the corner control heuristic
+    "corner": lambda **options: Player(
+        Negamax(partial(corner_control, x_weight=0.5, o_weight=0.5), max_depth=0, alphabeta=False, **options),
+        root_moves=corners_while_free),
+    "corner_minimax": lambda **options: Player(minimax(**options), root_moves=corners_while_free),
+    "corner_alpha_beta": lambda **options: Player(alpha_beta(**options), root_moves=corners_while_free),
+    "minimax": lambda **options: Player(minimax(**options)),
+    "minimax_alpha_beta": lambda **options: Player(alpha_beta(**options)),
+    "symmetry": lambda **options: Player(symmetric_minimax(**options)),
+    # Iterative deepening until the time limit, scoring the last ply with the line heuristic
+    "heuristic": lambda **options: Player(timed(line_potential, **options)),
+}
+
+
+def _with_book(player, section, name):
+    """``player`` with the variant's line of the opening book, if the book is built"""
+    loaded = opening_book.load()
+    if loaded is not None:
+        player.book = loaded.opening(section, name)
+    return player
+
+
+def create(name, book=True, **options):
+    """Player of one of the stand-alone variants"""
+    if name not in VARIANTS:
+        raise ValueError(f"Unknown variant {name!r}, expected one of {', '.join(VARIANTS)}")
+    player = VARIANTS[name](**options)
+    return _with_book(player, "variants", name) if book else player
+
+
+def create_modern(variant_type, book=True, **options):
+    """Player of a modern game board variant; unknown types play plain minimax, as the board did"""
+    if variant_type not in MODERN_VARIANTS:
+        variant_type = "minimax"
+    player = MODERN_VARIANTS[variant_type](**options)
+    return _with_book(player, "modern", variant_type) if book else player
@@ -0,0 +1,61 @@
+"""
+Zobrist hashing of positions.
+
+Every (side, cell) pair gets a fixed random 64-bit key and a position's
+hash is the XOR of the keys of its pieces, plus SIDE_KEY when O is to
+move. Playing or taking back a move is a single XOR, so the searches
+carry the hash down the tree instead of rebuilding a key at every node.
+
+The symmetric variant keeps one hash per board symmetry: hash ``t`` is the
+hash of the position transformed by symmetry ``t``. The smallest of the 8
+is the same for every rotation and reflection of a position.
+"""
+
+import random
+
+from engine.bitboard import CELL_BITS, CELLS
+from engine.symmetry import PERMUTATIONS
+
+X, O = 0, 1
+
+_random = random.Random(0x7A7B)
+KEYS = tuple(tuple(_random.getrandbits(64) for _ in range(CELLS)) for _ in (X, O))
+SIDE_KEY = _random.getrandbits(64)
+
+# Keys by cell bit, with the side-to-move flip folded in, for the search loops
+X_MOVE_KEYS = {CELL_BITS[cell]: KEYS[X][cell] ^ SIDE_KEY for cell in range(CELLS)}
+O_MOVE_KEYS = {CELL_BITS[cell]: KEYS[O][cell] ^ SIDE_KEY for cell in range(CELLS)}
+
+# SYMMETRIC_MOVE_KEYS[side][bit][t]: key of the cell the move lands on under symmetry t
+SYMMETRIC_MOVE_KEYS = tuple(
+    {
+        CELL_BITS[cell]: tuple(KEYS[side][permutation[cell]] ^ SIDE_KEY for permutation in PERMUTATIONS)
+        for cell in range(CELLS)
+    }
+    for side in (X, O)
+)
+
+
+def hash_position(x, o, x_to_move):
+    """Hash of a position computed from scratch"""
+    value = 0 if x_to_move else SIDE_KEY
+    for cell in range(CELLS):
+        if x & CELL_BITS[cell]:
+            value ^= KEYS[X][cell]
+        elif o & CELL_BITS[cell]:
+            value ^= KEYS[O][cell]
+    return value
+
+
+def symmetric_hashes(x, o, x_to_move):
+    """The 8 transformed hashes of a position computed from scratch"""
+    hashes = []
+    for permutation in PERMUTATIONS:
+        value = 0 if x_to_move else SIDE_KEY
+        for cell in range(CELLS):
+            if x & CELL_BITS[cell]:
+                value ^= KEYS[X][permutation[cell]]
+            elif o & CELL_BITS[cell]:
+                value ^= KEYS[O][permutation[cell]]
+        hashes.append(value)
+    return tuple(hashes)
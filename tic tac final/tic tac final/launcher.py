@@ -0,0 +1,83 @@
+"""
+Opens the game variants inside the menu's process.
+
+Running a variant script with subprocess starts a new interpreter, which
+imports tkinter, the engine and its tables, and opens the tablebase
+before the first board appears. The Launcher instead imports each script
+once as a module and opens its game in a Toplevel of the menu's Tk root,
+the same way the script's ``__main__`` block does on its own Tk root. A
+launch then only builds the window. The modules, the engine's tables and
+the memory-mapped tablebase stay loaded between launches.
+
+``prewarm()`` imports the scripts one per idle callback after the menu
+appears, so even the first launch finds its module loaded without
+freezing the menu.
+
+Every game still has its own player and worker thread. Closing its
+window cancels its search and destroys only that window.
+"""
+
+import importlib.util
+import os
+import re
+import sys
+import tkinter as tk
+
+from styled_wrapper import create_styled_game
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class Launcher:
+    def __init__(self, root, scripts):
+        self.root = root
+        self.scripts = list(scripts)
+        self.modules = {}
+
+    def path(self, script_name):
+        return os.path.join(HERE, script_name)
+
+    def exists(self, script_name):
+        return os.path.isfile(self.path(script_name))
+
+    def load(self, script_name):
+        """The script imported as a module, once; its ``__main__`` block does not run"""
+        module = self.modules.get(script_name)
+        if module is None:
+            name = "variant_" + re.sub(r"\W", "_", os.path.splitext(script_name)[0])
+            spec = importlib.util.spec_from_file_location(name, self.path(script_name))
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[name]
+                raise
+            self.modules[script_name] = module
+        return module
+
+    def prewarm(self):
+        """Import every script that is not loaded yet, one per idle callback"""
+        pending = [name for name in self.scripts if name not in self.modules and self.exists(name)]
+        if pending:
+            self.root.after_idle(self._prewarm_next, pending)
+
+    def _prewarm_next(self, pending):
+        try:
+            self.load(pending.pop(0))
+        except Exception as e:
+            # The launch itself will report it
+            print(f"Could not preload a variant: {e}")
+        if pending:
+            self.root.after_idle(self._prewarm_next, pending)
+
+    def open(self, script_name):
+        """Open the script's game in a new window, as running the script would; returns the window"""
+        module = self.load(script_name)
+        window = tk.Toplevel(self.root)
+        try:
+            create_styled_game(module.TicTacToe)(window)
+        except BaseException:
+            window.destroy()
+            raise
+        return window
@@ -1,8 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox, font
-import subprocess
-import sys
-import os
+from launcher import Launcher
 
 # Map each submenu option to the script filename you provided
 menu_structure = {
@@ -75,6 +73,11 @@ class ModernMenuApp:
         # Set initial status
         self.status_var.set("Ready to launch a game variant")
 
+        # Games open in this process; load their modules while the menu is idle
+        scripts = [script for options in menu_structure.values() for script in options.values()]
+        self.launcher = Launcher(root, scripts)
+        self.launcher.prewarm()
+
     def center_window(self):
         """Center the window on the screen"""
         self.root.update_idletasks()
@@ -422,7 +425,7 @@ class ModernMenuApp:
         self.run_button.config(relief=tk.SUNKEN)
         self.run_button.after(200, lambda: self.run_button.config(relief=tk.RAISED))
         
-        if not os.path.isfile(script_name):
+        if not self.launcher.exists(script_name):
             messagebox.showerror("Error", f"Script '{script_name}' not found.")
             self.status_var.set(f"Error: Script '{script_name}' not found")
             return
@@ -438,10 +441,9 @@ class ModernMenuApp:
                 
         update_status(f"Launching {script_name}")
         
-        # Run the script in a separate process
+        # Open the game in a window of this process
         try:
-            # Use python executable compatible with current environment
-            subprocess.Popen([sys.executable, script_name])
+            self.launcher.open(script_name)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to run script: {e}")
             self.status_var.set(f"Error: Failed to run script")
@@ -1,9 +1,10 @@
 import tkinter as tk
 from tkinter import messagebox, font
 import time
-import matplotlib.pyplot as plt
-import math
-import sys
+from ai_worker import AIWorker
+from stats_plot import pyplot, show
+from engine.bitboard import cell_position, from_board
+from engine.variants import create_modern
 
 class ModernTicTacToe:
     def __init__(self, master, variant_type="center"):
@@ -40,11 +41,17 @@ class ModernTicTacToe:
         self.board = [['-' for _ in range(3)] for _ in range(3)]
         self.current_player = self.choose_starting_player()
         self.execution_times = []
-        self.space_complexity = []
+        self.search_stats = []
         self.x_score = 0
         self.o_score = 0
         self.winning_line = None
         self.variant_type = variant_type
+        self.player = create_modern(variant_type)
+        # The search runs on a worker thread so the window keeps repainting while the AI thinks
+        self.worker = AIWorker(master, self.player)
+        self.pending_ai_move = None
+        # Closing the window also drops a scheduled AI move, which would otherwise run on the destroyed window
+        master.winfo_toplevel().protocol("WM_DELETE_WINDOW", self.close)
         
         # Create main frame
         self.main_frame = tk.Frame(master, bg=self.colors["background"], padx=20, pady=20)
@@ -70,7 +77,7 @@ class ModernTicTacToe:
         # Start game if AI goes first
         if self.current_player == 'X':
             self.status_var.set("AI (X) is thinking...")
-            master.after(500, self.ai_move)
+            self.schedule_ai_move(500)
 
     def center_window(self, window):
         """Center the window on the screen"""
@@ -261,363 +268,34 @@ class ModernTicTacToe:
         
         return 0
 
-    def minimax(self, board, depth, is_maximizing):
-        """Basic minimax algorithm"""
-        score = self.evaluate(board)
-        if score == 10:
-            return score - depth
-        if score == -10:
-            return score + depth
-        if not any('-' in row for row in board):
-            return 0
+    def schedule_ai_move(self, delay):
+        """Start the AI move after ``delay`` milliseconds, unless the board is reset first"""
+        self.pending_ai_move = self.buttons[0][0].after(delay, self.ai_move)
 
-        if is_maximizing:
-            best = -math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'X'
-                        best = max(best, self.minimax(board, depth + 1, not is_maximizing))
-                        board[i][j] = '-'
-            return best
-        else:
-            best = math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'O'
-                        best = min(best, self.minimax(board, depth + 1, not is_maximizing))
-                        board[i][j] = '-'
-            return best
-
-    def minimax_alpha_beta(self, board, depth, alpha, beta, is_maximizing):
-        """Minimax algorithm with alpha-beta pruning"""
-        score = self.evaluate(board)
-        if score == 10:
-            return score - depth
-        if score == -10:
-            return score + depth
-        if not any('-' in row for row in board):
-            return 0
-
-        if is_maximizing:
-            best = -math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'X'
-                        val = self.minimax_alpha_beta(board, depth + 1, alpha, beta, False)
-                        best = max(best, val)
-                        alpha = max(alpha, best)
-                        board[i][j] = '-'
-                        if beta <= alpha:
-                            break
-            return best
-        else:
-            best = math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'O'
-                        val = self.minimax_alpha_beta(board, depth + 1, alpha, beta, True)
-                        best = min(best, val)
-                        beta = min(beta, best)
-                        board[i][j] = '-'
-                        if beta <= alpha:
-                            break
-            return best
-
-    def is_symmetric_position(self, board, i, j):
-        """Check if a position is symmetric to one already evaluated"""
-        # Implement symmetry reduction logic here
-        # This is a simplified version
-        if i == j:  # Diagonal symmetry
-            return True
-        return False
-
-    def minimax_with_symmetry(self, board, depth, is_maximizing):
-        """Minimax with symmetry reduction"""
-        score = self.evaluate(board)
-        if score == 10:
-            return score - depth
-        if score == -10:
-            return score + depth
-        if not any('-' in row for row in board):
-            return 0
-
-        if is_maximizing:
-            best = -math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-' and not self.is_symmetric_position(board, i, j):
-                        board[i][j] = 'X'
-                        best = max(best, self.minimax_with_symmetry(board, depth + 1, not is_maximizing))
-                        board[i][j] = '-'
-            return best
-        else:
-            best = math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-' and not self.is_symmetric_position(board, i, j):
-                        board[i][j] = 'O'
-                        best = min(best, self.minimax_with_symmetry(board, depth + 1, not is_maximizing))
-                        board[i][j] = '-'
-            return best
-
-    def heuristic_evaluation(self, board):
-        """Heuristic evaluation function for faster computation"""
-        # Count lines that can still be completed
-        x_potential = 0
-        o_potential = 0
-        
-        # Check rows
-        for row in board:
-            if 'O' not in row:
-                x_potential += row.count('X')
-            if 'X' not in row:
-                o_potential += row.count('O')
-                
-        # Check columns
-        for col in range(3):
-            column = [board[row][col] for row in range(3)]
-            if 'O' not in column:
-                x_potential += column.count('X')
-            if 'X' not in column:
-                o_potential += column.count('O')
-                
-        # Check diagonals
-        diag1 = [board[i][i] for i in range(3)]
-        if 'O' not in diag1:
-            x_potential += diag1.count('X')
-        if 'X' not in diag1:
-            o_potential += diag1.count('O')
-            
-        diag2 = [board[i][2-i] for i in range(3)]
-        if 'O' not in diag2:
-            x_potential += diag2.count('X')
-        if 'X' not in diag2:
-            o_potential += diag2.count('O')
-            
-        return x_potential - o_potential
+    def cancel_ai_move(self):
+        """Stop the AI move that is scheduled or being searched, if any"""
+        if self.pending_ai_move is not None:
+            self.buttons[0][0].after_cancel(self.pending_ai_move)
+            self.pending_ai_move = None
+        self.worker.cancel()
 
-    def minimax_with_heuristic(self, board, depth, max_depth, is_maximizing):
-        """Minimax with depth limit and heuristic evaluation"""
-        score = self.evaluate(board)
-        if score == 10:
-            return score - depth
-        if score == -10:
-            return score + depth
-        if not any('-' in row for row in board) or depth >= max_depth:
-            return self.heuristic_evaluation(board)
-
-        if is_maximizing:
-            best = -math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'X'
-                        best = max(best, self.minimax_with_heuristic(board, depth + 1, max_depth, not is_maximizing))
-                        board[i][j] = '-'
-            return best
-        else:
-            best = math.inf
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == '-':
-                        board[i][j] = 'O'
-                        best = min(best, self.minimax_with_heuristic(board, depth + 1, max_depth, not is_maximizing))
-                        board[i][j] = '-'
-            return best
+    def close(self):
+        """Close the window once no AI move can run on it"""
+        self.cancel_ai_move()
+        self.worker.close()
 
     def ai_move(self):
         """AI move based on the selected variant"""
+        self.pending_ai_move = None
         # Measure execution time
-        start_time = time.time()
-
-        # Different AI logic based on variant type
-        if self.variant_type.startswith("center"):
-            # Try to take center if available
-            if self.board[1][1] == '-':
-                row, col = 1, 1
-            else:
-                best_val = -math.inf
-                best_move = (-1, -1)
-
-                for i in range(3):
-                    for j in range(3):
-                        if self.board[i][j] == '-':
-                            self.board[i][j] = 'X'
-                            
-                            # Choose algorithm based on variant
-                            if self.variant_type == "center":
-                                move_val = self.evaluate(self.board)
-                            elif self.variant_type == "center_minimax":
-                                move_val = self.minimax(self.board, 0, False)
-                            elif self.variant_type == "center_alpha_beta":
-                                move_val = self.minimax_alpha_beta(self.board, 0, -math.inf, math.inf, False)
-                            else:
-                                move_val = self.evaluate(self.board)
-                                
-                            self.board[i][j] = '-'
+        self.move_start_time = time.time()
 
-                            if move_val > best_val:
-                                best_move = (i, j)
-                                best_val = move_val
+        x, o = from_board(self.board)
+        self.worker.start(x, o, self.place_ai_move)
 
-                row, col = best_move
-                
-        elif self.variant_type.startswith("corner"):
-            # Try to take a corner if available
-            corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
-            corner_available = False
-            
-            for i, j in corners:
-                if self.board[i][j] == '-':
-                    corner_available = True
-                    break
-                    
-            if corner_available:
-                best_val = -math.inf
-                best_move = (-1, -1)
-                
-                for i, j in corners:
-                    if self.board[i][j] == '-':
-                        self.board[i][j] = 'X'
-                        
-                        # Choose algorithm based on variant
-                        if self.variant_type == "corner":
-                            move_val = self.evaluate(self.board)
-                        elif self.variant_type == "corner_minimax":
-                            move_val = self.minimax(self.board, 0, False)
-                        elif self.variant_type == "corner_alpha_beta":
-                            move_val = self.minimax_alpha_beta(self.board, 0, -math.inf, math.inf, False)
-                        else:
-                            move_val = self.evaluate(self.board)
-                            
-                        self.board[i][j] = '-'
-                        
-                        if move_val > best_val:
-                            best_move = (i, j)
-                            best_val = move_val
-                            
-                row, col = best_move
-            else:
-                # If no corner is available, use regular minimax
-                best_val = -math.inf
-                best_move = (-1, -1)
-                
-                for i in range(3):
-                    for j in range(3):
-                        if self.board[i][j] == '-':
-                            self.board[i][j] = 'X'
-                            
-                            # Choose algorithm based on variant
-                            if self.variant_type == "corner":
-                                move_val = self.evaluate(self.board)
-                            elif self.variant_type == "corner_minimax":
-                                move_val = self.minimax(self.board, 0, False)
-                            elif self.variant_type == "corner_alpha_beta":
-                                move_val = self.minimax_alpha_beta(self.board, 0, -math.inf, math.inf, False)
-                            else:
-                                move_val = self.evaluate(self.board)
-                                
-                            self.board[i][j] = '-'
-                            
-                            if move_val > best_val:
-                                best_move = (i, j)
-                                best_val = move_val
-                                
-                row, col = best_move
-                
-        elif self.variant_type == "minimax":
-            # Basic minimax
-            best_val = -math.inf
-            best_move = (-1, -1)
-            
-            for i in range(3):
-                for j in range(3):
-                    if self.board[i][j] == '-':
-                        self.board[i][j] = 'X'
-                        move_val = self.minimax(self.board, 0, False)
-                        self.board[i][j] = '-'
-                        
-                        if move_val > best_val:
-                            best_move = (i, j)
-                            best_val = move_val
-                            
-            row, col = best_move
-            
-        elif self.variant_type == "minimax_alpha_beta":
-            # Minimax with alpha-beta pruning
-            best_val = -math.inf
-            best_move = (-1, -1)
-            
-            for i in range(3):
-                for j in range(3):
-                    if self.board[i][j] == '-':
-                        self.board[i][j] = 'X'
-                        move_val = self.minimax_alpha_beta(self.board, 0, -math.inf, math.inf, False)
-                        self.board[i][j] = '-'
-                        
-                        if move_val > best_val:
-                            best_move = (i, j)
-                            best_val = move_val
-                            
-            row, col = best_move
-            
-        elif self.variant_type == "symmetry":
-            # Minimax with symmetry reduction
-            best_val = -math.inf
-            best_move = (-1, -1)
-            
-            for i in range(3):
-                for j in range(3):
-                    if self.board[i][j] == '-' and not self.is_symmetric_position(self.board, i, j):
-                        self.board[i][j] = 'X'
-                        move_val = self.minimax_with_symmetry(self.board, 0, False)
-                        self.board[i][j] = '-'
-                        
-                        if move_val > best_val:
-                            best_move = (i, j)
-                            best_val = move_val
-                            
-            row, col = best_move
-            
-        elif self.variant_type == "heuristic":
-            # Minimax with heuristic evaluation
-            best_val = -math.inf
-            best_move = (-1, -1)
-            
-            for i in range(3):
-                for j in range(3):
-                    if self.board[i][j] == '-':
-                        self.board[i][j] = 'X'
-                        move_val = self.minimax_with_heuristic(self.board, 0, 3, False)  # Depth limit of 3
-                        self.board[i][j] = '-'
-                        
-                        if move_val > best_val:
-                            best_move = (i, j)
-                            best_val = move_val
-                            
-            row, col = best_move
-            
-        else:
-            # Default to basic minimax
-            best_val = -math.inf
-            best_move = (-1, -1)
-            
-            for i in range(3):
-                for j in range(3):
-                    if self.board[i][j] == '-':
-                        self.board[i][j] = 'X'
-                        move_val = self.minimax(self.board, 0, False)
-                        self.board[i][j] = '-'
-                        
-                        if move_val > best_val:
-                            best_move = (i, j)
-                            best_val = move_val
-                            
-            row, col = best_move
+    def place_ai_move(self, cell, stats):
+        """Play the move found by the worker thread, on the Tk thread"""
+        row, col = cell_position(cell)
 
         # Update board state
         self.board[row][col] = 'X'
@@ -645,13 +323,17 @@ class ModernTicTacToe:
 
         # Calculate and store metrics
         end_time = time.time()
-        execution_time = end_time - start_time
+        execution_time = end_time - self.move_start_time
         self.execution_times.append(execution_time)
+        self.search_stats.append(stats)
 
-        space_used = sys.getsizeof(self.board)
-        self.space_complexity.append(space_used)
-
-        print(f"AI Move Execution Time: {execution_time} seconds, Space Complexity: {space_used} bytes")
+        print(f"AI Move Execution Time: {execution_time} seconds")
+        print(f"Search: {stats}")
+        print(f"Event Loop Lag: {self.worker.lags[-1] * 1000:.1f} ms")
+        if self.player.engine.table is not None:
+            print(f"Transposition Table: {self.player.engine.table}")
+        if self.player.engine.ordering is not None:
+            print(f"Move Ordering: {self.player.engine.ordering}")
 
     def animate_button(self, row, col, player):
         """Animate the button when a move is made"""
@@ -742,7 +424,7 @@ class ModernTicTacToe:
             elif any('-' in row for row in self.board):
                 self.current_player = 'X'
                 self.status_var.set("AI (X) is thinking...")
-                self.buttons[0][0].after(800, self.ai_move)
+                self.schedule_ai_move(800)
             else:
                 self.status_var.set("It's a tie!")
                 self.buttons[0][0].after(1000, lambda: messagebox.showinfo("Tic Tac Toe Variants", "It's a tie!"))
@@ -752,6 +434,9 @@ class ModernTicTacToe:
         """Reset the game board with animation"""
         play_again = messagebox.askyesno("Tic Tac Toe Variants", "Do you want to play again?")
         if play_again:
+            # Stop the AI move that is scheduled or being searched for the old board
+            self.cancel_ai_move()
+            
             # Fade out animation
             def fade_out(alpha):
                 if alpha > 0:
@@ -786,7 +471,7 @@ class ModernTicTacToe:
                     # Start new game
                     if self.current_player == 'X':
                         self.status_var.set("AI (X) is thinking...")
-                        self.buttons[0][0].after(800, self.ai_move)
+                        self.schedule_ai_move(800)
                     else:
                         self.status_var.set("Your turn (O)")
             
@@ -804,6 +489,7 @@ class ModernTicTacToe:
             return
             
         # Create a more visually appealing plot
+        plt = pyplot()
         plt.figure(figsize=(10, 6))
         plt.style.use('ggplot')
         
@@ -820,24 +506,25 @@ class ModernTicTacToe:
         plt.grid(True, linestyle='--', alpha=0.7)
         plt.legend()
         
-        # Plot space complexity
+        # Plot the nodes searched
+        nodes = [stats.nodes for stats in self.search_stats]
         plt.subplot(2, 1, 2)
-        plt.plot(moves, self.space_complexity, marker='s', color='#e74c3c',
-                linewidth=2, markersize=8, label='Space Complexity')
-        plt.fill_between(moves, self.space_complexity, alpha=0.3, color='#e74c3c')
+        plt.plot(moves, nodes, marker='^', color='#9b59b6',
+                linewidth=2, markersize=8, label='Nodes Searched')
+        plt.fill_between(moves, nodes, alpha=0.3, color='#9b59b6')
         plt.xlabel('AI Moves', fontsize=12)
-        plt.ylabel('Memory (bytes)', fontsize=12)
-        plt.title('Space Complexity Analysis', fontsize=14, fontweight='bold')
+        plt.ylabel('Nodes', fontsize=12)
+        plt.title('Search Effort Analysis', fontsize=14, fontweight='bold')
         plt.grid(True, linestyle='--', alpha=0.7)
         plt.legend()
         
         plt.tight_layout()
-        plt.show()
+        show(plt, "complexity.png")
         
         # Calculate and display averages
-        average_time_complexity = sum(self.execution_times) / len(self.execution_times)
-        average_space_complexity = sum(self.space_complexity) / len(self.space_complexity)
+        average_time = sum(self.execution_times) / len(self.execution_times)
+        average_nodes = sum(nodes) / len(nodes)
         
         messagebox.showinfo("Complexity Analysis", 
-                          f"Average Time Complexity: {average_time_complexity:.6f} seconds\n"
-                          f"Average Space Complexity: {average_space_complexity:.2f} bytes")
+                          f"Average Time: {average_time:.6f} seconds\n"
+                          f"Average Nodes Searched: {average_nodes:.1f}")
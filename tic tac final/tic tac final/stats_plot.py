@@ -0,0 +1,84 @@
+"""
+Plot of the time and search statistics the game variants record per AI move.
+
+Each variant keeps ``execution_times`` and ``search_stats`` (one
+engine.search.SearchStats per move, empty for moves made by a rule such as
+taking the center) and hands both lists to ``show_search_stats``.
+
+matplotlib is only imported when a plot is first drawn, through
+``pyplot()``: it is the slowest import of any game, and most games never
+draw a plot. Without a display it runs on the non-interactive Agg
+backend and ``show()`` saves the figure to a file instead.
+"""
+
+import os
+import sys
+
+# (label, SearchStats attribute) of the work counters drawn together
+COUNTERS = (
+    ("Nodes", "nodes"),
+    ("Leaf Evaluations", "leaves"),
+    ("Cutoffs", "cutoffs"),
+    ("Cache Hits", "cache_hits"),
+)
+
+
+def headless():
+    """True if there is no display to open a plot window on"""
+    if sys.platform in ("win32", "darwin"):
+        return False
+    return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def pyplot():
+    """matplotlib.pyplot, imported on first use; on the Agg backend when headless unless MPLBACKEND says otherwise"""
+    import matplotlib
+    if headless() and "MPLBACKEND" not in os.environ:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def show(plt, filename):
+    """Show the current figure, or save it to ``filename`` on a non-interactive backend"""
+    if plt.get_backend().lower() == "agg":
+        plt.savefig(filename)
+        print(f"No display to show the plot on, saved it to {os.path.abspath(filename)}")
+    else:
+        plt.show()
+
+
+def average(values):
+    values = [value for value in values if value is not None]
+    return sum(values) / len(values) if values else 0
+
+
+def show_search_stats(execution_times, search_stats):
+    if not execution_times:
+        print("No AI moves recorded yet")
+        return
+
+    plt = pyplot()
+    moves = list(range(1, len(execution_times) + 1))
+    figure, (time_axis, work_axis, depth_axis) = plt.subplots(3, 1, sharex=True, figsize=(8, 8))
+
+    time_axis.plot(moves, execution_times, marker='o')
+    time_axis.set_ylabel('Time (s)')
+    time_axis.set_title('Search Statistics for Each AI Move')
+
+    for label, name in COUNTERS:
+        work_axis.plot(moves, [getattr(stats, name) for stats in search_stats], marker='o', label=label)
+    work_axis.set_ylabel('Count')
+    work_axis.set_yscale('symlog')
+    work_axis.legend()
+
+    depth_axis.plot(moves, [stats.max_depth for stats in search_stats], marker='o')
+    depth_axis.set_ylabel('Max Depth (plies)')
+    depth_axis.set_xlabel('AI Moves')
+
+    figure.tight_layout()
+    show(plt, "search_stats.png")
+
+    print(f"Average Time: {average(execution_times)} seconds")
+    print(f"Average Nodes: {average([stats.nodes for stats in search_stats])}")
+    print(f"Average Max Depth: {average([stats.max_depth for stats in search_stats])} plies")
@@ -1,9 +1,5 @@
 import tkinter as tk
-from tkinter import messagebox, font
-import time
-import matplotlib.pyplot as plt
-import math
-import sys
+from tkinter import font
 
 class StyledTicTacToe:
     """
@@ -32,17 +28,27 @@ class StyledTicTacToe:
         
         # Create the original game instance but don't use its UI
         # We'll create our own styled UI but use the original game logic
-        self.game = self.original_game_class(self.board_frame)
+        self.game = self.colored_game_class()(self.board_frame)
         
         # Override the original buttons with styled ones
         self.create_styled_buttons(self.board_frame)
         
         # Create styled calculate button
         self.create_styled_calculate_button(self.main_frame)
-        
-        # Start game if AI goes first (using original game logic)
-        if self.game.current_player == 'X':
-            self.game.ai_move_with_center()
+    
+    def colored_game_class(self):
+        """
+        The original game class, coloring each AI move as it lands. AI moves
+        are placed when the worker thread finishes, after on_click_wrapper
+        has returned, and the game's __init__ already starts the first one
+        when the AI plays first, so the game must be built with it.
+        """
+        styled = self
+        class ColoredGame(self.original_game_class):
+            def place_ai_move(self, cell, stats):
+                super().place_ai_move(cell, stats)
+                styled.color_ai_moves()
+        return ColoredGame
     
     def create_header(self, parent):
         """Create a styled header with game title"""
@@ -135,6 +141,10 @@ class StyledTicTacToe:
         
         # The AI's move is handled by the original game logic
         # We just need to ensure X moves have the right color
+        self.color_ai_moves()
+    
+    def color_ai_moves(self):
+        """Give every X on the board the X color"""
         for i in range(3):
             for j in range(3):
                 if self.game.board[i][j] == 'X' and self.game.buttons[i][j]['fg'] != self.colors["x_color"]: